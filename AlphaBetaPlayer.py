@@ -0,0 +1,257 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Computer player for GessGame that picks moves with an alpha-beta search.
+
+import time
+
+from EvaluationCache import threatened_rings
+from TranspositionTable import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+# Score of a won position. Wins found sooner score higher, so a win in n plies scores WIN_SCORE - n.
+WIN_SCORE = 1000000
+# Scores at least this far from 0 are wins or losses rather than evaluations.
+_WIN_THRESHOLD = WIN_SCORE - 10000
+
+
+def _to_table(score, ply):
+    """Takes a score found 'ply' plies below the root and returns it as stored in the transposition table, where a
+    win or loss counts its plies from the stored position rather than from the root of the search that found it."""
+    if score >= _WIN_THRESHOLD:
+        return score + ply
+    if score <= -_WIN_THRESHOLD:
+        return score - ply
+    return score
+
+
+def _from_table(score, ply):
+    """Takes a score from the transposition table and returns it for a position 'ply' plies below the root."""
+    if score >= _WIN_THRESHOLD:
+        return score - ply
+    if score <= -_WIN_THRESHOLD:
+        return score + ply
+    return score
+
+
+def make_evaluation(ring_weight=100, stone_weight=1, mobility_weight=0, threat_weight=0, cache=None):
+    """Takes the weight of each part of the evaluation and returns a function that scores a GessGame position for the
+    player whose turn it is. The parts are the difference in ring counts, the difference in stone counts, the
+    number of legal moves the player to move has, and the number of the opponent's rings the player to move could
+    break with one move. Mobility and threats mean generating every legal move, so they are the most expensive parts
+    and are off unless given a weight. With an EvaluationCache as 'cache' the parts are looked up there instead of
+    being counted again for positions already seen."""
+    if cache is not None and (mobility_weight or threat_weight) and not cache.counts_moves():
+        raise ValueError("Mobility and threats need an evaluation cache that counts moves.")
+
+    def evaluate(game):
+        """Takes a GessGame and returns its score for the player whose turn it is."""
+        if cache is not None:
+            rings, other_rings, stones, other_stones, moves, threatened = cache.features(game)
+            return (ring_weight * (rings - other_rings) + stone_weight * (stones - other_stones) +
+                    mobility_weight * moves + threat_weight * threatened)
+
+        player = game.get_current_player()
+        if player == 'X':
+            other_player = 'O'
+        else:
+            other_player = 'X'
+        score = ring_weight * (game.get_ring_count(player) - game.get_ring_count(other_player))
+        score += stone_weight * (game.get_stone_count(player) - game.get_stone_count(other_player))
+        if mobility_weight or threat_weight:
+            moves = list(game.legal_moves())
+            score += mobility_weight * len(moves)
+            if threat_weight:
+                score += threat_weight * threatened_rings(game, moves, other_player)
+        return score
+
+    return evaluate
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget runs out."""
+    pass
+
+
+class AlphaBetaPlayer:
+    """Picks moves for whichever player's turn it is in a GessGame. Uses a negamax alpha-beta search with iterative
+    deepening, so it always has the best move from the deepest search it finished when its time or node budget runs
+    out. Moves are ordered by the transposition table's best move, then killer moves, then the history heuristic.
+    The search only uses the game's own rules (legal_moves, push_move and pop_move, which run make_move), so every
+    move it picks is one the game will accept."""
+
+    def __init__(self, evaluation=None, time_limit=1.0, node_limit=None, max_depth=64, table=None, book=None):
+        """Initializes the player. 'evaluation' is a function scoring a GessGame for the player to move (see
+        make_evaluation). 'time_limit' is in seconds and 'node_limit' in positions searched; either can be None for
+        no limit, but not both unless 'max_depth' is small. 'table' is the TranspositionTable to use, which is kept
+        between moves. 'book' is an OpeningBook to take moves from, when it has one, instead of searching."""
+        if evaluation is None:
+            evaluation = make_evaluation()
+        if table is None:
+            table = TranspositionTable()
+        self._evaluation = evaluation
+        self._time_limit = time_limit
+        self._node_limit = node_limit
+        self._max_depth = max_depth
+        self._table = table
+        self._book = book
+        self._history = {}
+        self._killers = {}
+        self._nodes = 0
+        self._deadline = None
+        self._last_search = {}
+
+    def get_last_search_info(self):
+        """Returns a dictionary describing the most recent search: the move picked, whether it came from the opening
+        book, its score, the deepest depth completed, the positions searched, the seconds taken and the positions
+        searched per second."""
+        return self._last_search
+
+    def choose_move(self, game):
+        """Takes a GessGame and returns the move to make for the player whose turn it is, as a Move (see
+        GessGame.legal_moves) that can be passed to make_move. Returns None if the game is over or there is no
+        legal move. The game is searched in place but is back in its original position when this returns."""
+        start = time.perf_counter()
+        if self._time_limit is not None:
+            self._deadline = start + self._time_limit
+        else:
+            self._deadline = None
+        self._nodes = 0
+        self._history.clear()
+        self._killers.clear()
+
+        best_move = None
+        best_score = 0
+        depth_reached = 0
+        book_move = None
+        if self._book is not None:
+            book_move = self._book.choose_move(game)
+        if book_move is not None:
+            best_move = book_move
+        elif game.get_game_state() == "UNFINISHED":
+            moves = list(game.legal_moves())
+            if moves:
+                best_move = moves[0]
+            for depth in range(1, self._max_depth + 1):
+                try:
+                    score, move = self._search_root(game, moves, depth, best_move)
+                except _SearchTimeout:
+                    break
+                best_score = score
+                best_move = move
+                depth_reached = depth
+                if abs(score) >= WIN_SCORE - self._max_depth:
+                    # A forced win or loss was found, searching deeper won't change it
+                    break
+
+        seconds = time.perf_counter() - start
+        self._last_search = {
+            "move": best_move,
+            "book": book_move is not None,
+            "score": best_score,
+            "depth": depth_reached,
+            "nodes": self._nodes,
+            "seconds": seconds,
+            "nodes_per_second": self._nodes / seconds if seconds > 0 else 0.0
+        }
+        return best_move
+
+    def _check_budget(self):
+        """Counts a searched position and raises _SearchTimeout if the node or time budget has run out."""
+        self._nodes += 1
+        if self._node_limit is not None and self._nodes > self._node_limit:
+            raise _SearchTimeout
+        # A node can take a millisecond with an expensive evaluation, so the clock is read at every one; that costs
+        # far less than generating the node's moves
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise _SearchTimeout
+
+    def _search_root(self, game, moves, depth, previous_best):
+        """Searches every root move to the given depth, starting with the previous iteration's best move. Returns
+        the best score and move."""
+        ordered = self._order_moves(moves, previous_best, 0)
+        alpha = -WIN_SCORE - 1
+        beta = WIN_SCORE + 1
+        best_move = ordered[0]
+        for move in ordered:
+            self._check_budget()
+            game.push_move(move)
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, 1)
+            finally:
+                game.pop_move()
+            if score > alpha:
+                alpha = score
+                best_move = move
+        self._table.store(game.get_position_hash(), depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(self, game, depth, alpha, beta, ply):
+        """Returns the score of the game's position for the player to move, searched to the given depth."""
+        self._check_budget()
+        if game.get_game_state() != "UNFINISHED":
+            # The player who just moved broke the last ring of the player to move
+            return -WIN_SCORE + ply
+        if depth == 0:
+            return self._evaluation(game)
+
+        key = game.get_position_hash()
+        table_move = None
+        entry = self._table.probe(key)
+        if entry is not None:
+            table_move = entry[4]
+            if entry[1] >= depth:
+                value = _from_table(entry[2], ply)
+                if entry[3] == EXACT:
+                    return value
+                if entry[3] == LOWER_BOUND and value >= beta:
+                    return value
+                if entry[3] == UPPER_BOUND and value <= alpha:
+                    return value
+
+        moves = list(game.legal_moves())
+        if not moves:
+            # A player who can't move has lost
+            return -WIN_SCORE + ply
+
+        original_alpha = alpha
+        best_score = -WIN_SCORE - 1
+        best_move = None
+        for move in self._order_moves(moves, table_move, ply):
+            game.push_move(move)
+            try:
+                score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                game.pop_move()
+            if score > best_score:
+                best_score = score
+                best_move = move
+            if score > alpha:
+                alpha = score
+            if alpha >= beta:
+                self._killers[ply] = move
+                self._history[move] = self._history.get(move, 0) + depth * depth
+                break
+
+        if best_score <= original_alpha:
+            flag = UPPER_BOUND
+        elif best_score >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._table.store(key, depth, _to_table(best_score, ply), flag, best_move)
+        return best_score
+
+    def _order_moves(self, moves, first_move, ply):
+        """Returns the moves sorted so the most promising are searched first: the given move (usually the
+        transposition table's best move), then the killer move for this ply, then by history score."""
+        history = self._history
+        killer = self._killers.get(ply)
+
+        def priority(move):
+            """Returns the sort key for a move, lowest first."""
+            if move == first_move:
+                return -2 * WIN_SCORE
+            if move == killer:
+                return -WIN_SCORE
+            return -history.get(move, 0)
+
+        return sorted(moves, key=priority)
@@ -0,0 +1,195 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Replays archived GessGame move lists across a pool of processes to re-validate them.
+
+import argparse
+import collections
+import multiprocessing
+import os
+import sys
+import time
+
+from GessGame import GessGame, Move
+
+
+def parse_game(line):
+    """Takes one line of a move log and returns its moves as a list of (current_center, new_center) tuples. Moves
+    are separated by whitespace and written as the two centers joined by a dash, for example "c3-c4 b13-c14". A move
+    that isn't two centers is kept as the original text so the replay can report it as illegal."""
+    moves = []
+    for text in line.split():
+        centers = text.split('-')
+        if len(centers) == 2:
+            moves.append((centers[0], centers[1]))
+        else:
+            moves.append(text)
+    return moves
+
+
+def iter_positions(path, size=20):
+    """Generator that reads the move log at 'path' one line at a time and yields a tuple of (game number, Move, game)
+    for every move played, where game is the GessGame just after the move. Game numbers are the line numbers, blank
+    lines and lines starting with '#' are skipped, and each game stops at its first illegal move (see replay_game).
+
+    Nothing is built ahead of what has been yielded: each move's text is read into a Move once, and the game yielded
+    is the same GessGame updated in place for every move of a game, so memory use stays the same however large the
+    log is. Use the game's clone() or to_bytes() to keep a position past the next move."""
+    with open(path) as log_file:
+        for game_number, line in enumerate(log_file, 1):
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            game = GessGame(size)
+            for text in line.split():
+                try:
+                    move = Move.parse(text)
+                    legal = game.make_move(move)
+                except ValueError:
+                    # Text that can't be read as two centers
+                    legal = False
+                if not legal:
+                    break
+                yield game_number, move, game
+
+
+def replay_game(moves):
+    """Takes a list of moves (as returned by parse_game) and plays them in a new GessGame, stopping at the first one
+    make_move rejects. Returns a tuple of (final game state, number of moves played, number of the first illegal
+    move counting from 1 or None, the first illegal move or None)."""
+    game = GessGame()
+    for number, move in enumerate(moves, 1):
+        try:
+            legal = not isinstance(move, str) and game.make_move(move[0], move[1])
+        except (ValueError, IndexError):
+            # Centers that can't be read as a column letter and row number
+            legal = False
+        if not legal:
+            if not isinstance(move, str):
+                move = move[0] + '-' + move[1]
+            return game.get_game_state(), number - 1, number, move
+    return game.get_game_state(), len(moves), None, None
+
+
+def _replay_batch(batch):
+    """Takes a list of (game number, log line) tuples and returns a list of (game number,) + replay_game() result
+    tuples for them. Runs in the worker processes."""
+    results = []
+    for game_number, line in batch:
+        results.append((game_number,) + replay_game(parse_game(line)))
+    return results
+
+
+def _read_batches(log_file, batch_size):
+    """Generator that reads a move log one line at a time and yields lists of up to batch_size (game number, line)
+    tuples. Game numbers are the line numbers, and blank lines and lines starting with '#' are skipped."""
+    batch = []
+    for game_number, line in enumerate(log_file, 1):
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        batch.append((game_number, line))
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class BatchReplayer:
+    """Re-validates archives of finished games. Each line of an archive is one game's move list (see parse_game).
+    Games are sent in batches to a pool of worker processes, and only a fixed number of batches are read ahead of the
+    results being handed back. Memory use stays the same however large the archive is, and results come back in
+    archive order."""
+
+    def __init__(self, workers=None, batch_size=256):
+        """Initializes the replayer with the number of worker processes (defaults to the number of CPUs) and the
+        number of games sent to a worker at a time."""
+        if workers is None:
+            workers = os.cpu_count() or 1
+        self._workers = workers
+        self._batch_size = batch_size
+        self._games = 0
+        self._moves = 0
+        self._illegal_games = 0
+        self._states = collections.Counter()
+        self._seconds = 0.0
+
+    def replay(self, path):
+        """Generator that replays every game in the archive at 'path' and yields a tuple for each one of (game
+        number, final game state, number of moves played, number of the first illegal move or None, the first
+        illegal move or None). The totals from get_summary() are updated as results are yielded."""
+        start = time.perf_counter()
+        with open(path) as log_file:
+            batches = _read_batches(log_file, self._batch_size)
+            if self._workers == 1:
+                for batch in batches:
+                    for result in self._count(_replay_batch(batch)):
+                        yield result
+            else:
+                with multiprocessing.Pool(self._workers) as pool:
+                    pending = collections.deque()
+                    for batch in batches:
+                        pending.append(pool.apply_async(_replay_batch, (batch,)))
+                        if len(pending) >= self._workers * 2:
+                            for result in self._count(pending.popleft().get()):
+                                yield result
+                    while pending:
+                        for result in self._count(pending.popleft().get()):
+                            yield result
+        self._seconds += time.perf_counter() - start
+
+    def _count(self, results):
+        """Adds a batch of results to the running totals and returns them."""
+        for result in results:
+            self._games += 1
+            self._moves += result[2]
+            self._states[result[1]] += 1
+            if result[3] is not None:
+                self._illegal_games += 1
+        return results
+
+    def get_summary(self):
+        """Returns a dictionary of totals for everything replayed so far: games, moves played, games with an illegal
+        move, a count of each final game state, seconds spent, games per second and moves per second."""
+        if self._seconds > 0:
+            games_per_second = self._games / self._seconds
+            moves_per_second = self._moves / self._seconds
+        else:
+            games_per_second = 0.0
+            moves_per_second = 0.0
+        return {
+            "games": self._games,
+            "moves": self._moves,
+            "illegal_games": self._illegal_games,
+            "states": dict(self._states),
+            "seconds": self._seconds,
+            "games_per_second": games_per_second,
+            "moves_per_second": moves_per_second
+        }
+
+
+def main(argv=None):
+    """Command line entry point. Replays the given archives and writes one tab separated line per game to standard
+    output, followed by the totals on standard error."""
+    parser = argparse.ArgumentParser(description="Replay archived Gess games and report their results.")
+    parser.add_argument("archives", nargs='+', help="move log files, one game per line")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: number of CPUs)")
+    parser.add_argument("--batch-size", type=int, default=256, help="games sent to a worker at a time")
+    args = parser.parse_args(argv)
+
+    replayer = BatchReplayer(args.workers, args.batch_size)
+    for path in args.archives:
+        for game_number, state, moves, illegal_number, illegal_move in replayer.replay(path):
+            print("%s\t%d\t%s\t%d\t%s\t%s" % (path, game_number, state, moves,
+                                              '-' if illegal_number is None else illegal_number,
+                                              '-' if illegal_move is None else illegal_move))
+
+    summary = replayer.get_summary()
+    sys.stderr.write("%d games, %d moves, %d with an illegal move in %.2f s (%.1f games/s, %.1f moves/s)\n" % (
+        summary["games"], summary["moves"], summary["illegal_games"], summary["seconds"],
+        summary["games_per_second"], summary["moves_per_second"]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
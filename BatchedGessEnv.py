@@ -0,0 +1,362 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Many Gess games held in one NumPy array and stepped together, for self-play and simulation.
+
+import numpy as np
+
+from GessGame import _STARTING_ROWS, _COLUMNS, _DIRECTION_STEPS
+
+# Values stored in the board array.
+EMPTY = 0
+BLACK = 1
+WHITE = 2
+
+# Game states, indexed by the codes returned from get_game_states().
+GAME_STATES = ('UNFINISHED', 'BLACK_WINS', 'WHITE_WINS')
+
+_SIZE = 20
+_CENTERS = _SIZE - 2  # centers are rows and columns 2 through 19, 0 through 17 once offset
+_MAX_DISTANCE = _CENTERS - 1
+_DIRECTIONS = tuple(_DIRECTION_STEPS.values())  # same order as GessGame, starting with NW
+
+# An action is a direction, a distance and a piece center:
+# ((direction * 17 + distance - 1) * 18 + center_row) * 18 + center_column, with center rows and columns counted from 0.
+# Grouping actions by direction and distance first keeps each slice of the legal move mask contiguous.
+NUM_ACTIONS = _CENTERS * _CENTERS * len(_DIRECTIONS) * _MAX_DISTANCE
+
+_PAD = 3  # padding around the occupancy array so partial footprints near the edge can be sliced
+
+
+def _starting_board():
+    """Returns the starting layout as a 20x20 int8 array."""
+    board = np.zeros((_SIZE, _SIZE), dtype=np.int8)
+    for row, layout in enumerate(_STARTING_ROWS):
+        for column, space in enumerate(layout):
+            if space == 'X':
+                board[row, column] = BLACK
+            elif space == 'O':
+                board[row, column] = WHITE
+    return board
+
+
+def _build_destination_masks():
+    """Returns a (8, 17, 18, 18) bool array that is True where moving a piece from a center by that direction and
+    distance keeps its new center on the playable part of the board."""
+    rows = np.arange(_CENTERS)[:, None]
+    columns = np.arange(_CENTERS)[None, :]
+    masks = np.zeros((len(_DIRECTIONS), _MAX_DISTANCE, _CENTERS, _CENTERS), dtype=bool)
+    for d, (row_step, column_step) in enumerate(_DIRECTIONS):
+        for distance in range(1, _MAX_DISTANCE + 1):
+            new_rows = rows + row_step * distance
+            new_columns = columns + column_step * distance
+            masks[d, distance - 1] = (new_rows >= 0) & (new_rows < _CENTERS) & \
+                (new_columns >= 0) & (new_columns < _CENTERS)
+    return masks
+
+
+def _build_partial_offsets():
+    """Returns, for each direction and for steps 1 and 2, the offsets from a piece's center of the spaces in the
+    footprint that many steps along which are outside the piece's own footprint. The piece is lifted before it moves,
+    so only these spaces can block the first two steps."""
+    offsets = []
+    for row_step, column_step in _DIRECTIONS:
+        by_step = []
+        for step in (1, 2):
+            spaces = []
+            for row_offset in (-1, 0, 1):
+                for column_offset in (-1, 0, 1):
+                    row = row_step * step + row_offset
+                    column = column_step * step + column_offset
+                    if abs(row) > 1 or abs(column) > 1:
+                        spaces.append((row, column))
+            by_step.append(spaces)
+        offsets.append(by_step)
+    return offsets
+
+
+_STARTING_BOARD = _starting_board()
+_DESTINATION_MASKS = _build_destination_masks()
+_PARTIAL_OFFSETS = _build_partial_offsets()
+_FOOTPRINT = [(row, column) for row in (-1, 0, 1) for column in (-1, 0, 1)]
+_RING = [offset for offset in _FOOTPRINT if offset != (0, 0)]
+_FOOTPRINT_ROWS = np.array([offset[0] for offset in _FOOTPRINT])
+_FOOTPRINT_COLUMNS = np.array([offset[1] for offset in _FOOTPRINT])
+_DIRECTION_ARRAY = np.array(_DIRECTIONS)
+_PATH_STEPS = np.arange(1, _MAX_DISTANCE)  # steps a piece can pass over before its last one
+
+
+def _footprint_sum(spaces):
+    """Takes an (N, 20, 20) array and returns the (N, 18, 18) sums of its 3x3 footprints, one per center."""
+    total = np.zeros((spaces.shape[0], _CENTERS, _CENTERS), dtype=np.int16)
+    for row, column in _FOOTPRINT:
+        total += spaces[:, 1 + row:_SIZE - 1 + row, 1 + column:_SIZE - 1 + column]
+    return total
+
+
+def _has_ring(boards, players):
+    """Takes an (N, 20, 20) board array and an (N,) array of players and returns an (N,) bool array of whether each
+    player has a ring, searching the same centers as GessGame.ring_check (rows and columns 3 through 18)."""
+    stones = boards == players[:, None, None]
+    rings = boards[:, 2:18, 2:18] == EMPTY
+    for row, column in _RING:
+        rings &= stones[:, 2 + row:18 + row, 2 + column:18 + column]
+    return rings.any(axis=(1, 2))
+
+
+def _decode(actions):
+    """Takes an array of actions and returns arrays of the piece's current center row and column, and its new center
+    row and column, all as board array indexes."""
+    columns = actions % _CENTERS + 1
+    rest = actions // _CENTERS
+    rows = rest % _CENTERS + 1
+    rest = rest // _CENTERS
+    distances = rest % _MAX_DISTANCE + 1
+    directions = rest // _MAX_DISTANCE
+    steps = np.array(_DIRECTIONS)
+    new_rows = rows + steps[directions, 0] * distances
+    new_columns = columns + steps[directions, 1] * distances
+    return rows, columns, new_rows, new_columns
+
+
+def _apply_moves(boards, indexes, rows, columns, new_rows, new_columns):
+    """Moves one piece on each of the boards at 'indexes' from the given centers to the given new centers, the way
+    make_move does: the piece is lifted, replaces everything in its new footprint, then any of its stones that are
+    over the edge of the board are removed. The moves must already be known to be valid."""
+    row_offsets = np.array([offset[0] for offset in _FOOTPRINT])
+    column_offsets = np.array([offset[1] for offset in _FOOTPRINT])
+    board_index = indexes[:, None]
+    old_rows = rows[:, None] + row_offsets
+    old_columns = columns[:, None] + column_offsets
+    placed_rows = new_rows[:, None] + row_offsets
+    placed_columns = new_columns[:, None] + column_offsets
+
+    piece = boards[board_index, old_rows, old_columns]
+    boards[board_index, old_rows, old_columns] = EMPTY
+    boards[board_index, placed_rows, placed_columns] = piece
+
+    over_edge = (placed_rows == 0) | (placed_rows == _SIZE - 1) | (placed_columns == 0) | \
+        (placed_columns == _SIZE - 1)
+    boards[np.broadcast_to(board_index, over_edge.shape)[over_edge], placed_rows[over_edge],
+           placed_columns[over_edge]] = EMPTY
+
+
+class BatchedGessEnv:
+    """Holds a batch of Gess games as one (N, 20, 20) int8 array (EMPTY, BLACK or WHITE per space) along with each
+    game's turn number and state, and works on all of them at once with array operations. The rules are the same as
+    GessGame.make_move, edge_removal and ring_check, including ring_check only rejecting black's suicides.
+
+    Moves are given as actions (see NUM_ACTIONS and encode_move). legal_mask() gives every legal action for every
+    game, and step() makes one action in each game."""
+
+    def __init__(self, num_games):
+        """Initializes 'num_games' games, all in the starting layout with black to move."""
+        self._boards = np.broadcast_to(_STARTING_BOARD, (num_games, _SIZE, _SIZE)).copy()
+        self._turn_numbers = np.ones(num_games, dtype=np.int64)
+        self._states = np.zeros(num_games, dtype=np.int8)
+
+    def __len__(self):
+        """Returns the number of games in the batch."""
+        return self._boards.shape[0]
+
+    def reset(self, indexes=None):
+        """Puts the games at 'indexes' (all of them if None) back to the starting layout."""
+        if indexes is None:
+            indexes = slice(None)
+        self._boards[indexes] = _STARTING_BOARD
+        self._turn_numbers[indexes] = 1
+        self._states[indexes] = 0
+
+    def get_boards(self):
+        """Returns the (N, 20, 20) board array. Row and column 0 are row 1 and column A of the printed board."""
+        return self._boards
+
+    def get_turn_numbers(self):
+        """Returns the (N,) array of turn numbers. Black moves on odd turns and white on even turns."""
+        return self._turn_numbers
+
+    def get_current_players(self):
+        """Returns an (N,) array of the player to move in each game, BLACK or WHITE."""
+        return np.where(self._turn_numbers % 2 == 0, WHITE, BLACK).astype(np.int8)
+
+    def get_game_states(self):
+        """Returns the (N,) array of game state codes, which index GAME_STATES."""
+        return self._states
+
+    @staticmethod
+    def encode_move(current_center, new_center):
+        """Takes strings for a piece's current and new center (for example "c3" and "c6") and returns the matching
+        action, or None if the new center isn't a straight line from the current one."""
+        row = int(current_center[1:]) - 2
+        column = _COLUMNS.index(current_center[0].upper()) - 1
+        row_change = int(new_center[1:]) - 2 - row
+        column_change = _COLUMNS.index(new_center[0].upper()) - 1 - column
+        distance = max(abs(row_change), abs(column_change))
+        if distance == 0 or (row_change and column_change and abs(row_change) != abs(column_change)):
+            return None
+        direction = _DIRECTIONS.index((int(np.sign(row_change)), int(np.sign(column_change))))
+        return ((direction * _MAX_DISTANCE + distance - 1) * _CENTERS + row) * _CENTERS + column
+
+    @staticmethod
+    def decode_action(action):
+        """Takes an action and returns the (current_center, new_center) strings for it, as make_move takes them, or
+        None if the action would move the piece's center off the playable part of the board."""
+        rows, columns, new_rows, new_columns = _decode(np.array([action]))
+        if not (1 <= new_rows[0] < _SIZE - 1 and 1 <= new_columns[0] < _SIZE - 1):
+            return None
+        return (_COLUMNS[columns[0]].lower() + str(rows[0] + 1),
+                _COLUMNS[new_columns[0]].lower() + str(new_rows[0] + 1))
+
+    def _pseudo_legal_mask(self):
+        """Returns an (N, 8, 17, 18, 18) bool array of the moves that pass is_valid_move and obstruction_check for
+        the player to move, without checking for suicide."""
+        boards = self._boards
+        players = self.get_current_players()
+        num_games = boards.shape[0]
+        own = boards == players[:, None, None]
+        occupied = boards != EMPTY
+        unfinished = (self._states == 0)[:, None, None]
+
+        # A piece has at least one of the player's stones and none of the opponent's
+        pieces = (_footprint_sum(own) > 0) & (_footprint_sum(occupied & ~own) == 0) & unfinished
+        center_filled = own[:, 1:_SIZE - 1, 1:_SIZE - 1]
+        # Footprints that block a piece passing over them, padded so slices past the edge read as blocked
+        blocked = np.pad(_footprint_sum(occupied) > 0, ((0, 0), (_MAX_DISTANCE, _MAX_DISTANCE),
+                                                        (_MAX_DISTANCE, _MAX_DISTANCE)), constant_values=True)
+        padded_occupied = np.pad(occupied, ((0, 0), (_PAD, _PAD), (_PAD, _PAD)))
+
+        mask = np.zeros((num_games, len(_DIRECTIONS), _MAX_DISTANCE, _CENTERS, _CENTERS), dtype=bool)
+        for d, (row_step, column_step) in enumerate(_DIRECTIONS):
+            movable = pieces & own[:, 1 + row_step:_SIZE - 1 + row_step, 1 + column_step:_SIZE - 1 + column_step]
+            clear = np.ones((num_games, _CENTERS, _CENTERS), dtype=bool)
+            for distance in range(1, _MAX_DISTANCE + 1):
+                if distance > 1:
+                    step = distance - 1
+                    if step <= 2:
+                        step_blocked = np.zeros((num_games, _CENTERS, _CENTERS), dtype=bool)
+                        for row, column in _PARTIAL_OFFSETS[d][step - 1]:
+                            step_blocked |= padded_occupied[:, _PAD + 1 + row:_PAD + _SIZE - 1 + row,
+                                                            _PAD + 1 + column:_PAD + _SIZE - 1 + column]
+                    else:
+                        row_start = _MAX_DISTANCE + row_step * step
+                        column_start = _MAX_DISTANCE + column_step * step
+                        step_blocked = blocked[:, row_start:row_start + _CENTERS,
+                                               column_start:column_start + _CENTERS]
+                    clear &= ~step_blocked
+                reachable = movable & clear & _DESTINATION_MASKS[d, distance - 1]
+                if distance > 3:
+                    reachable &= center_filled
+                mask[:, d, distance - 1] = reachable
+        return mask
+
+    def legal_mask(self):
+        """Returns an (N, NUM_ACTIONS) bool array that is True for every action make_move would accept in each game.
+        Games that are over have no legal actions."""
+        mask = self._pseudo_legal_mask().reshape(len(self), NUM_ACTIONS)
+        players = self.get_current_players()
+        games, actions = np.nonzero(mask & (players == BLACK)[:, None])
+        if len(games):
+            suicides = self._suicides(games, actions, players)
+            mask[games[suicides], actions[suicides]] = False
+        return mask
+
+    def _suicides(self, games, actions, players):
+        """Takes arrays of games and pseudo legal actions in them and returns a bool array of which actions would
+        leave the player moving without a ring. Moves that don't touch the footprint of some ring of the player are
+        cleared with a count of rings near the two centers; only the rest are played out on copies of the boards."""
+        rows, columns, new_rows, new_columns = _decode(actions)
+        stones = self._boards == players[:, None, None]
+        rings = self._boards[:, 2:18, 2:18] == EMPTY
+        for row, column in _RING:
+            rings &= stones[:, 2 + row:18 + row, 2 + column:18 + column]
+        # Running totals of rings, indexed by board row and column, to count the rings in any rectangle
+        ring_totals = np.zeros((len(self), _SIZE + 1, _SIZE + 1), dtype=np.int32)
+        ring_totals[:, 3:19, 3:19] = rings.cumsum(axis=1).cumsum(axis=2)
+        ring_totals[:, 19:, 3:19] = ring_totals[:, 18:19, 3:19]
+        ring_totals[:, :, 19:] = ring_totals[:, :, 18:19]
+
+        def count(row_start, row_end, column_start, column_end):
+            """Returns the number of rings in each game's rectangle of board rows and columns, ends included."""
+            row_start = np.clip(row_start, 0, _SIZE)
+            column_start = np.clip(column_start, 0, _SIZE)
+            row_end = np.clip(row_end + 1, 0, _SIZE)
+            column_end = np.clip(column_end + 1, 0, _SIZE)
+            empty = (row_end <= row_start) | (column_end <= column_start)
+            total = ring_totals[games, row_end, column_end] - ring_totals[games, row_start, column_end] - \
+                ring_totals[games, row_end, column_start] + ring_totals[games, row_start, column_start]
+            return np.where(empty, 0, total)
+
+        near = count(rows - 2, rows + 2, columns - 2, columns + 2) + \
+            count(new_rows - 2, new_rows + 2, new_columns - 2, new_columns + 2) - \
+            count(np.maximum(rows, new_rows) - 2, np.minimum(rows, new_rows) + 2,
+                  np.maximum(columns, new_columns) - 2, np.minimum(columns, new_columns) + 2)
+        suicides = np.zeros(len(games), dtype=bool)
+        unsure = np.nonzero(rings.sum(axis=(1, 2))[games] <= near)[0]
+        for start in range(0, len(unsure), 4096):
+            chunk = unsure[start:start + 4096]
+            boards = self._boards[games[chunk]]
+            _apply_moves(boards, np.arange(len(chunk)), rows[chunk], columns[chunk], new_rows[chunk],
+                         new_columns[chunk])
+            suicides[chunk] = ~_has_ring(boards, players[games[chunk]])
+        return suicides
+
+    def _check_actions(self, games, actions, players):
+        """Takes arrays of games, one action in each and the player to move in each, and returns a bool array of
+        which actions pass is_valid_move and obstruction_check, along with the decoded centers (see _decode). Only
+        the chosen actions are looked at: the piece, its direction stone, the distance limit and the spaces passed
+        over along each action's own line."""
+        rows, columns, new_rows, new_columns = _decode(actions)
+        directions = actions // (_CENTERS * _CENTERS * _MAX_DISTANCE)
+        distances = np.maximum(np.abs(new_rows - rows), np.abs(new_columns - columns))
+        row_steps = _DIRECTION_ARRAY[directions, 0]
+        column_steps = _DIRECTION_ARRAY[directions, 1]
+        valid = (new_rows >= 1) & (new_rows < _SIZE - 1) & (new_columns >= 1) & (new_columns < _SIZE - 1)
+
+        boards = self._boards[games]
+        board_index = np.arange(len(games))[:, None]
+        piece = boards[board_index, rows[:, None] + _FOOTPRINT_ROWS, columns[:, None] + _FOOTPRINT_COLUMNS]
+        own = piece == players[:, None]
+        # A piece has at least one of the player's stones and none of the opponent's, including in the direction
+        # it moves, and can go more than three spaces only with a stone in its center
+        valid &= own.any(axis=1) & ((piece == EMPTY) | own).all(axis=1)
+        valid &= own[board_index[:, 0], (row_steps + 1) * 3 + column_steps + 1]
+        valid &= (distances <= 3) | own[:, 4]
+
+        # Every space in the footprints the piece passes over before its last step, apart from the ones it lifted
+        # itself from. Steps past the last one are clipped onto the board and ignored.
+        passed_rows = _PATH_STEPS[:, None] * row_steps[:, None, None] + _FOOTPRINT_ROWS
+        passed_columns = _PATH_STEPS[:, None] * column_steps[:, None, None] + _FOOTPRINT_COLUMNS
+        checked = (_PATH_STEPS[:, None] < distances[:, None, None]) & \
+            ((np.abs(passed_rows) > 1) | (np.abs(passed_columns) > 1))
+        passed = boards[board_index[:, :, None], np.clip(rows[:, None, None] + passed_rows, 0, _SIZE - 1),
+                        np.clip(columns[:, None, None] + passed_columns, 0, _SIZE - 1)]
+        valid &= ~((passed != EMPTY) & checked).any(axis=(1, 2))
+        return valid, rows, columns, new_rows, new_columns
+
+    def step(self, actions):
+        """Takes an (N,) array with an action for each game, or -1 to leave a game alone, and makes each move the same
+        way make_move would. Moves make_move would reject leave their game unchanged. Returns an (N,) bool array of
+        which games had their move made."""
+        actions = np.asarray(actions, dtype=np.int64)
+        players = self.get_current_players()
+        games = np.nonzero((actions >= 0) & (self._states == 0))[0]
+        valid, rows, columns, new_rows, new_columns = self._check_actions(games, actions[games], players[games])
+        games = games[valid]
+        accepted = np.zeros(len(self), dtype=bool)
+        if not len(games):
+            return accepted
+
+        saved = self._boards[games].copy()
+        rows, columns, new_rows, new_columns = rows[valid], columns[valid], new_rows[valid], new_columns[valid]
+        _apply_moves(self._boards, games, rows, columns, new_rows, new_columns)
+
+        # Same as ring_check: only black is stopped from breaking their own last ring
+        suicides = (players[games] == BLACK) & ~_has_ring(self._boards[games], players[games])
+        self._boards[games[suicides]] = saved[suicides]
+        games = games[~suicides]
+        accepted[games] = True
+
+        opponents = np.where(players[games] == BLACK, WHITE, BLACK).astype(np.int8)
+        winners = games[~_has_ring(self._boards[games], opponents)]
+        self._states[winners] = np.where(players[winners] == BLACK, 1, 2)
+        self._turn_numbers[games] += 1
+        return accepted
@@ -0,0 +1,418 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Repeatable benchmarks of the core GessGame and FBoard operations, with stored baselines and a
+#              comparison report that flags regressions.
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import random
+import sys
+import time
+
+import GessInstrumentation
+from FBoard import FBoard
+from GessGame import GessGame, _COLUMNS
+
+# Every benchmark is built from these seeds, so each run times exactly the same work.
+SEED = 5232020
+# A benchmark is a regression when its median time per operation is this fraction slower than the baseline's, or
+# the spread of the baseline's repeats if that is larger. On a shared machine the medians of separate runs of the
+# same code have differed by up to about 50% (eight runs of 7 repeats against one baseline, most for the shortest
+# benchmarks), so a smaller threshold flags unchanged code. Compare on a quiet machine with a lower --threshold to
+# catch smaller regressions.
+DEFAULT_THRESHOLD = 0.6
+
+_POSITION_GAMES = 24
+_MAX_GAME_MOVES = 200
+_CASES = 400
+
+
+def _random_games(seed, games, max_moves):
+    """Plays 'games' random games of up to 'max_moves' moves each and returns a list with a list of every unfinished
+    position reached in each, packed with GessGame.to_bytes."""
+    rng = random.Random(seed)
+    played = []
+    for _ in range(games):
+        game = GessGame()
+        positions = [game.to_bytes()]
+        for _ in range(max_moves):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(rng.choice(moves))
+            if game.get_game_state() != "UNFINISHED":
+                break
+            positions.append(game.to_bytes())
+        played.append(positions)
+    return played
+
+
+def _candidate_moves(game):
+    """Returns every move from a center next to one of the player to move's stones, in a straight line and no more
+    than 18 spaces, which is every move with a chance of getting past the checks on the notation."""
+    player = game.get_current_player()
+    moves = []
+    for row in range(2, 20):
+        for column in range(2, 20):
+            if player not in game.create_footprint(_COLUMNS[column - 1].lower() + str(row)).values():
+                continue
+            for row_step, column_step in ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)):
+                for distance in range(1, 19):
+                    new_row = row + row_step * distance
+                    new_column = column + column_step * distance
+                    if not (2 <= new_row <= 19 and 2 <= new_column <= 19):
+                        break
+                    moves.append((_COLUMNS[column - 1].lower() + str(row),
+                                  _COLUMNS[new_column - 1].lower() + str(new_row)))
+    return moves
+
+
+_fixtures = {}
+
+
+def _get_fixtures():
+    """Returns the positions and moves the Gess benchmarks use, found from the fixed seed the first time they are
+    needed: a dictionary with the positions from random games, and a dictionary of (packed position, move) cases
+    for each result of make_move ("legal" or the reason GessInstrumentation gives for rejecting it)."""
+    if _fixtures:
+        return _fixtures
+    games = _random_games(SEED, _POSITION_GAMES, _MAX_GAME_MOVES)
+    positions = [position for game in games for position in game]
+    rng = random.Random(SEED)
+    sample = rng.sample(positions, min(len(positions), 16))
+
+    was_enabled = GessInstrumentation.is_enabled()
+    GessInstrumentation.enable()
+    moves = {}
+    try:
+        for position in sample:
+            for move in _candidate_moves(GessGame.from_bytes(position)):
+                before = dict(GessInstrumentation.snapshot()["rejections"])
+                if GessGame.from_bytes(position).make_move(move[0], move[1]):
+                    reason = "legal"
+                else:
+                    after = GessInstrumentation.snapshot()["rejections"]
+                    reason = next(reason for reason in after if after[reason] != before.get(reason, 0))
+                moves.setdefault(reason, []).append((position, move))
+    finally:
+        if not was_enabled:
+            GessInstrumentation.disable()
+
+    for reason in moves:
+        if len(moves[reason]) > _CASES:
+            moves[reason] = rng.sample(moves[reason], _CASES)
+    start = GessGame().to_bytes()
+    # Centers off the board or on its edge are rejected before the position is looked at
+    moves["off_board"] = [(start, ("a5", "c5")), (start, ("c5", "t5")), (start, ("c1", "c3")),
+                          (start, ("c5", "c20")), (start, ("u5", "c5"))] * (_CASES // 5)
+    moves["no_stones_in_piece"] = [(start, ("j10", "j11")), (start, ("e9", "h9"))] * (_CASES // 2)
+    resigned = GessGame()
+    resigned.resign_game()
+    moves["game_over"] = [(resigned.to_bytes(), ("c3", "c4"))] * _CASES
+
+    _fixtures["positions"] = positions
+    _fixtures["moves"] = moves
+    return _fixtures
+
+
+def _setup_make_move(reason):
+    """Returns a setup function making fresh games for the make_move cases with the given result."""
+
+    def setup():
+        """Returns a list of (game, current_center, new_center) cases."""
+        return [(GessGame.from_bytes(position), move[0], move[1])
+                for position, move in _get_fixtures()["moves"].get(reason, [])]
+
+    return setup
+
+
+def _run_make_move(cases):
+    """Makes each case's move and returns the number made."""
+    for game, current_center, new_center in cases:
+        game.make_move(current_center, new_center)
+    return len(cases)
+
+
+def _setup_is_valid_move(reason):
+    """Returns a setup function for checking the make_move cases with the given result with is_valid_move."""
+    cases = []
+
+    def setup():
+        """Returns a list of (game, current_center, new_center) cases. is_valid_move doesn't change the game, so the
+        cases are only made once, with one game for all the cases in the same position."""
+        if not cases:
+            games = {}
+            for position, move in _get_fixtures()["moves"].get(reason, []):
+                if position not in games:
+                    games[position] = GessGame.from_bytes(position)
+                cases.append((games[position], move[0], move[1]))
+        return cases
+
+    return setup
+
+
+def _run_is_valid_move(cases):
+    """Checks each case's move and returns the number checked."""
+    for game, current_center, new_center in cases:
+        game.is_valid_move(current_center, new_center)
+    return len(cases)
+
+
+def _setup_ring_check(sparse):
+    """Returns a setup function for the positions with the most stones, or with the fewest if 'sparse' is True."""
+    games = []
+
+    def setup():
+        """Returns a list of games, only made once since ring_check doesn't change them."""
+        if not games:
+            games.extend(GessGame.from_bytes(position) for position in _get_fixtures()["positions"])
+            games.sort(key=lambda game: game.get_stone_count('X') + game.get_stone_count('O'), reverse=not sparse)
+            del games[_CASES:]
+        return games
+
+    return setup
+
+
+def _run_ring_check(games):
+    """Checks both players' rings in each game and returns the number of checks."""
+    for game in games:
+        game.ring_check('X')
+        game.ring_check('O')
+    return 2 * len(games)
+
+
+def _setup_playout():
+    """Returns the seeds of the random games to play."""
+    return list(range(SEED, SEED + 4))
+
+
+def _run_playout(seeds):
+    """Plays a random game of up to 200 moves from each seed, picking from legal_moves, and returns the number of
+    games played."""
+    for seed in seeds:
+        rng = random.Random(seed)
+        game = GessGame()
+        for _ in range(_MAX_GAME_MOVES):
+            moves = list(game.legal_moves())
+            if not moves:
+                break
+            game.make_move(rng.choice(moves))
+            if game.get_game_state() != "UNFINISHED":
+                break
+    return len(seeds)
+
+
+def _fboard_moves(seed, piece, games, length):
+    """Makes 'length' random moves of only the given piece ('x' or 'o') in each of 'games' new FBoards, and returns
+    each game's moves as a list of (row, column) or (row, column, new_row, new_column) tuples, each one legal when it
+    is made. FBoard doesn't make the players take turns, so one piece's moves can be timed on their own."""
+    rng = random.Random(seed)
+    played = []
+    for _ in range(games):
+        board = FBoard()
+        moves = []
+        for _ in range(length):
+            if piece == "x":
+                row = board.get_x_row()
+                column = board.get_x_column()
+                options = [(row + row_step, column + column_step) for row_step in (-1, 1) for column_step in (-1, 1)
+                           if board.available_move_x(row + row_step, column + column_step)]
+            else:
+                options = [(row, column, row + row_step, column + column_step)
+                           for row, column in board.get_o_positions()
+                           for row_step, column_step in ((1, -1), (-1, 1), (-1, -1))
+                           if board.available_move_o(row, column, row + row_step, column + column_step)]
+            if not options:
+                break
+            move = rng.choice(options)
+            if piece == "x":
+                board.move_x(*move)
+            else:
+                board.move_o(*move)
+            moves.append(move)
+        played.append(moves)
+    return played
+
+
+def _setup_fboard(piece):
+    """Returns a setup function for replaying random moves of one FBoard piece."""
+    games = []
+
+    def setup():
+        """Returns a list of (new board, moves) cases."""
+        if not games:
+            games.extend(_fboard_moves(SEED, piece, 200, 50))
+        return [(FBoard(), moves) for moves in games]
+
+    return setup
+
+
+def _run_move_x(cases):
+    """Makes every case's 'x' moves and returns the number made."""
+    count = 0
+    for board, moves in cases:
+        for row, column in moves:
+            board.move_x(row, column)
+        count += len(moves)
+    return count
+
+
+def _run_move_o(cases):
+    """Makes every case's 'o' moves and returns the number made."""
+    count = 0
+    for board, moves in cases:
+        for row, column, new_row, new_column in moves:
+            board.move_o(row, column, new_row, new_column)
+        count += len(moves)
+    return count
+
+
+# Each benchmark is a name, a setup function returning fresh cases, and a run function that does the timed work on
+# the cases and returns the number of operations it did.
+BENCHMARKS = (
+    ("gess.make_move.legal", _setup_make_move("legal"), _run_make_move),
+    ("gess.make_move.obstructed", _setup_make_move("obstructed"), _run_make_move),
+    ("gess.make_move.suicide", _setup_make_move("suicide"), _run_make_move),
+    ("gess.ring_check.dense", _setup_ring_check(False), _run_ring_check),
+    ("gess.ring_check.sparse", _setup_ring_check(True), _run_ring_check),
+    ("gess.is_valid_move.game_over", _setup_is_valid_move("game_over"), _run_is_valid_move),
+    ("gess.is_valid_move.off_board", _setup_is_valid_move("off_board"), _run_is_valid_move),
+    ("gess.is_valid_move.opponent_stones_in_piece", _setup_is_valid_move("opponent_stones_in_piece"),
+     _run_is_valid_move),
+    ("gess.is_valid_move.no_stones_in_piece", _setup_is_valid_move("no_stones_in_piece"), _run_is_valid_move),
+    ("gess.is_valid_move.no_stone_in_direction", _setup_is_valid_move("no_stone_in_direction"), _run_is_valid_move),
+    ("gess.is_valid_move.too_far", _setup_is_valid_move("too_far"), _run_is_valid_move),
+    ("gess.playout", _setup_playout, _run_playout),
+    ("fboard.move_x", _setup_fboard("x"), _run_move_x),
+    ("fboard.move_o", _setup_fboard("o"), _run_move_o),
+)
+
+
+def _time_repeat(setup, run, min_seconds):
+    """Sets up and runs a benchmark as many times as it takes to spend 'min_seconds' in the timed part, so short
+    benchmarks aren't swamped by timer noise, and returns a tuple of (operations done, nanoseconds per operation), or
+    None if it has nothing to run. Setup isn't timed, and garbage collection is paused while timing, like timeit
+    does."""
+    seconds = 0.0
+    operations = 0
+    while seconds < min_seconds:
+        cases = setup()
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            done = run(cases)
+            seconds += time.perf_counter() - start
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+        if not done:
+            break
+        operations += done
+    if not operations:
+        return None
+    return operations, seconds / operations * 1e9
+
+
+def run_benchmarks(pattern='*', repeats=7, min_seconds=0.05):
+    """Runs every benchmark whose name matches the shell-style 'pattern' and returns a dictionary from benchmark name
+    to a dictionary of the operations timed in each repeat, the best and median nanoseconds per operation over
+    'repeats' repeats, and their spread: the range of the middle half of the repeats as a fraction of the median.
+    The repeats are taken in rounds, one of every benchmark per round, rather than all of one benchmark's in a row,
+    so a stretch of time when the machine is busier or slower falls on every benchmark's repeats alike instead of
+    moving one benchmark's median. Each repeat spends at least 'min_seconds' in the timed part (see _time_repeat)."""
+    selected = [(name, setup, run) for name, setup, run in BENCHMARKS if fnmatch.fnmatch(name, pattern)]
+    timings = {}
+    operations = {}
+    for _ in range(repeats):
+        for name, setup, run in selected:
+            timed = _time_repeat(setup, run, min_seconds)
+            if timed is not None:
+                operations[name], per_operation = timed
+                timings.setdefault(name, []).append(per_operation)
+
+    results = {}
+    for name, _, _ in selected:
+        if name not in timings:
+            continue
+        per_operation = sorted(timings[name])
+        median = per_operation[len(per_operation) // 2]
+        results[name] = {
+            "operations": operations[name],
+            "best_ns": per_operation[0],
+            "median_ns": median,
+            "spread": (per_operation[len(per_operation) * 3 // 4] - per_operation[len(per_operation) // 4]) / median
+        }
+    return results
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Takes baseline and current results from run_benchmarks and returns a list of (name, baseline nanoseconds,
+    current nanoseconds, fractional change, status) tuples, comparing median times, which move less between runs
+    than best times. A benchmark's allowed change is 'threshold', or the spread of its baseline repeats if that is
+    larger (baselines saved without a spread just use 'threshold'). Status is "REGRESSION" if the benchmark
+    is slower by more than that, "faster" if it is faster by more than that, "new" if it has no baseline, and "ok"
+    otherwise."""
+    rows = []
+    for name, result in current.items():
+        if name not in baseline:
+            rows.append((name, None, result["median_ns"], None, "new"))
+            continue
+        before = baseline[name]["median_ns"]
+        change = result["median_ns"] / before - 1
+        allowed = max(threshold, baseline[name].get("spread", 0.0))
+        if change > allowed:
+            status = "REGRESSION"
+        elif change < -allowed:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, before, result["median_ns"], change, status))
+    return rows
+
+
+def format_report(rows):
+    """Returns the rows from compare as a text table."""
+    lines = ["%-45s %12s %12s %8s  %s" % ("benchmark", "baseline ns", "current ns", "change", "status")]
+    for name, before, after, change, status in rows:
+        lines.append("%-45s %12s %12.0f %8s  %s" % (name, '-' if before is None else "%.0f" % before, after,
+                                                     '-' if change is None else "%+.1f%%" % (change * 100), status))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Command line entry point. Runs the benchmarks, optionally saving the results as a baseline or comparing them
+    with one. Exits with an error if a benchmark regressed."""
+    parser = argparse.ArgumentParser(description="Benchmark GessGame and FBoard and compare against a baseline.")
+    parser.add_argument("--filter", default='*', help="only run benchmarks matching this pattern, e.g. 'gess.*'")
+    parser.add_argument("--repeats", type=int, default=7, help="runs of each benchmark, the median is compared")
+    parser.add_argument("--save", help="write the results to this baseline file")
+    parser.add_argument("--compare", help="compare the results with this baseline file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="fraction slower than the baseline that counts as a regression, at least")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.filter, args.repeats)
+    if args.save:
+        with open(args.save, 'w') as baseline_file:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "seed": SEED,
+                       "results": results}, baseline_file, indent=2, sort_keys=True)
+            baseline_file.write('\n')
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+        rows = compare(baseline, results, args.threshold)
+    else:
+        rows = [(name, None, result["median_ns"], None, "") for name, result in results.items()]
+    print(format_report(rows))
+    if any(row[4] == "REGRESSION" for row in rows):
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Bounded least recently used cache of the features bots score GessGame positions by, with hit and miss
+#              counts.
+
+from collections import OrderedDict
+
+
+def threatened_rings(game, moves, other_player):
+    """Takes a GessGame, the legal moves of the player to move (as Moves, see GessGame.legal_moves) and the other
+    player, and returns how many of the other player's rings one of those moves would break. A piece landing anywhere
+    on a ring's footprint captures at least one of its stones, so a ring is threatened if a move lands within two
+    rows and two columns of its center."""
+    landings = set((move.new_row, move.new_column) for move in moves)
+    threatened = 0
+    for row, column in game.get_ring_centers(other_player):
+        if any((row + row_offset, column + column_offset) in landings
+               for row_offset in range(-2, 3) for column_offset in range(-2, 3)):
+            threatened += 1
+    return threatened
+
+
+class EvaluationCache:
+    """Stores the static features of GessGame positions so a position reached again, through a different order of
+    moves or by a later search, doesn't have to be measured again. Entries are keyed by
+    GessGame.get_position_hash(), which covers the player to move, and are tuples of (rings, opponent rings, stones,
+    opponent stones, legal moves, threatened rings), counted for the player to move. Threatened rings are the
+    opponent's rings the player to move could break with one move.
+
+    The cache never holds more than 'capacity' entries; the least recently used entry is dropped to make room. Hits,
+    misses and evictions are counted from when the cache is made until reset_stats()."""
+
+    def __init__(self, capacity=1 << 16, count_moves=True):
+        """Initializes an empty cache holding at most 'capacity' entries. Counting legal moves and threatened rings
+        means generating every legal move, so it is by far the most expensive part of a miss; with 'count_moves'
+        False both are stored as 0."""
+        if capacity < 1:
+            raise ValueError("An evaluation cache needs room for at least one entry.")
+        self._capacity = capacity
+        self._count_moves = count_moves
+        self._entries = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self):
+        """Returns the number of entries currently stored."""
+        return len(self._entries)
+
+    def get_capacity(self):
+        """Returns the largest number of entries the cache will hold."""
+        return self._capacity
+
+    def counts_moves(self):
+        """Returns True if the cache counts legal moves and threatened rings."""
+        return self._count_moves
+
+    def features(self, game):
+        """Takes a GessGame and returns the (rings, opponent rings, stones, opponent stones, legal moves, threatened
+        rings) tuple for its position, from the cache if it is there and otherwise measured and stored. The game
+        isn't changed."""
+        key = game.get_position_hash()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self._misses += 1
+        player = game.get_current_player()
+        if player == 'X':
+            other_player = 'O'
+        else:
+            other_player = 'X'
+        moves = 0
+        threatened = 0
+        if self._count_moves:
+            legal_moves = list(game.legal_moves())
+            moves = len(legal_moves)
+            threatened = threatened_rings(game, legal_moves, other_player)
+        entry = (game.get_ring_count(player), game.get_ring_count(other_player), game.get_stone_count(player),
+                 game.get_stone_count(other_player), moves, threatened)
+        if len(self._entries) == self._capacity:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+        self._entries[key] = entry
+        return entry
+
+    def get_stats(self):
+        """Returns a dictionary of the cache's hits, misses, hit rate (0.0 before any lookup), evictions, entries and
+        capacity."""
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "evictions": self._evictions,
+            "entries": len(self._entries),
+            "capacity": self._capacity
+        }
+
+    def reset_stats(self):
+        """Sets the hit, miss and eviction counts back to zero, keeping the entries."""
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def clear(self):
+        """Removes every entry from the cache. The counts are kept."""
+        self._entries.clear()
@@ -2,20 +2,45 @@
 # Date: 3/11/2020
 # Description: Simulates a boardgame-like game
 
+_SIZE = 8
+
+# Squares are numbered row * 8 + column, and the 'o' pieces are kept as a bitmask of those numbers.
+_STARTING_O = (1 << 5 * _SIZE + 7) | (1 << 6 * _SIZE + 6) | (1 << 7 * _SIZE + 5) | (1 << 7 * _SIZE + 7)
+
+
+def _build_trap_masks():
+    """Returns, for every square, a mask of the squares diagonal to it that are on the board: four in the middle of
+    the board, two along an edge and one in a corner."""
+    masks = []
+    for row in range(_SIZE):
+        for column in range(_SIZE):
+            mask = 0
+            for row_step in (-1, 1):
+                for column_step in (-1, 1):
+                    if _on_board(row + row_step, column + column_step):
+                        mask |= 1 << (row + row_step) * _SIZE + column + column_step
+            masks.append(mask)
+    return tuple(masks)
+
+
+def _on_board(row, column):
+    """Returns True if the row and column are on the board"""
+    return 0 <= row < _SIZE and 0 <= column < _SIZE
+
+
+_TRAP_MASKS = _build_trap_masks()
+
+
 class FBoard:
-    """Creates an FBoard game object"""
+    """Creates an FBoard game object. The 'o' pieces are stored as a bitmask with one bit per square, and the 'x'
+    piece as its row and column, so a game is only a few small integers."""
+
+    __slots__ = ('_o_board', '_x_row', '_x_column', '_game_state')
 
     def __init__(self):
-        """Initializes the game board to an 8 X 8 list of lists with player x in space (0, 0) and
-        o players in spaces (5, 7), (6, 6), (7, 5), and (7, 7)"""
-        self._game_board = [["x", "_", "_", "_", "_", "_", "_", "_"],
-                            ["_", "_", "_", "_", "_", "_", "_", "_"],
-                            ["_", "_", "_", "_", "_", "_", "_", "_"],
-                            ["_", "_", "_", "_", "_", "_", "_", "_"],
-                            ["_", "_", "_", "_", "_", "_", "_", "_"],
-                            ["_", "_", "_", "_", "_", "_", "_", "o"],
-                            ["_", "_", "_", "_", "_", "_", "o", "_"],
-                            ["_", "_", "_", "_", "_", "o", "_", "o"]]
+        """Initializes the game board with player x in space (0, 0) and o players in spaces (5, 7), (6, 6), (7, 5),
+        and (7, 7)"""
+        self._o_board = _STARTING_O
         self._game_state = "UNFINISHED"
         self._x_row = 0
         self._x_column = 0
@@ -32,87 +57,77 @@ class FBoard:
         """Returns the column of the 'x' piece"""
         return self._x_column
 
+    def get_o_positions(self):
+        """Returns a list of (row, column) tuples for the 'o' pieces, in board order"""
+        positions = []
+        o_board = self._o_board
+        while o_board:
+            low_bit = o_board & -o_board
+            positions.append(divmod(low_bit.bit_length() - 1, _SIZE))
+            o_board ^= low_bit
+        return positions
+
+    def _is_o(self, row, column):
+        """Returns True if there is an 'o' piece on the space, which must be on the board"""
+        return self._o_board >> (row * _SIZE + column) & 1 == 1
+
+    def _is_empty(self, row, column):
+        """Returns True if the space is on the board and has no piece on it"""
+        if not _on_board(row, column) or self._is_o(row, column):
+            return False
+        return row != self._x_row or column != self._x_column
+
     def available_move_x(self, new_x_row, new_x_column):
         """Checks if attempted move of 'x' piece is valid"""
-        if self._game_board[new_x_row][new_x_column] == "_":
-            if new_x_row == (self._x_row + 1):
-                if new_x_column == (self._x_column + 1):
-                    return True
-                elif new_x_column == (self._x_column - 1):
-                    return True
-                else:
-                    return False
-            elif new_x_row == (self._x_row - 1):
-                if new_x_column == (self._x_column + 1):
-                    return True
-                elif new_x_column == (self._x_column - 1):
-                    return True
-                else:
-                    return False
-            else:
-                return False
-        else:
+        if not self._is_empty(new_x_row, new_x_column):
             return False
+        return abs(new_x_row - self._x_row) == 1 and abs(new_x_column - self._x_column) == 1
 
     def available_move_o(self, initial_o_row, initial_o_column, new_o_row, new_o_column):
         """Checks if attempted move of 'o' piece is valid"""
-        if self._game_board[initial_o_row][initial_o_column] == "o":
-            if self._game_board[new_o_row][new_o_column] == "_":
-                if new_o_row == (initial_o_row + 1):
-                    if new_o_column == (initial_o_column - 1):
-                        return True
-                    else:
-                        return False
-                if new_o_row == (initial_o_row - 1):
-                    if new_o_column == (initial_o_column + 1):
-                        return True
-                    elif new_o_column == (initial_o_column - 1):
-                        return True
-                    else:
-                        return False
-                else:
-                    return False
-            else:
-                return False
-        else:
+        if not _on_board(initial_o_row, initial_o_column) or not self._is_o(initial_o_row, initial_o_column):
             return False
-
+        if not self._is_empty(new_o_row, new_o_column):
+            return False
+        if new_o_row == initial_o_row + 1:
+            return new_o_column == initial_o_column - 1
+        if new_o_row == initial_o_row - 1:
+            return abs(new_o_column - initial_o_column) == 1
+        return False
 
     def move_x(self, new_x_row, new_x_column):
         """Moves the x player along the game board"""
         if self._game_state != "UNFINISHED":
-            """Makes sure the game is still in progress"""
+            # Makes sure the game is still in progress
+            return False
+        if not self.available_move_x(new_x_row, new_x_column):
             return False
-        elif self.available_move_x(new_x_row, new_x_column):
-            """If the move is valid..."""
-            self._game_board[self._x_row][self._x_column] = "_"
-            self._x_row = new_x_row
-            self._x_column = new_x_column
-            self._game_board[self._x_row][self._x_column] = "x"
-            if self._game_board[7][7] == "x":
-                self._game_state = "X_WON"
-            return True
+        self._x_row = new_x_row
+        self._x_column = new_x_column
+        if self._x_row == _SIZE - 1 and self._x_column == _SIZE - 1:
+            self._game_state = "X_WON"
+        return True
 
     def move_o(self, initial_o_row, initial_o_column, new_o_row, new_o_column):
         """Selects an 'o' piece and moves it along the game board"""
         if self._game_state != "UNFINISHED":
-            """Makes sure the game is still in progress"""
+            # Makes sure the game is still in progress
             return False
-        elif self.available_move_o(initial_o_row, initial_o_column, new_o_row, new_o_column):
-            """If the move is valid..."""
-            self._game_board[initial_o_row][initial_o_column] = "_"
-            self._game_board[new_o_row][new_o_column] = "o"
-            if self._game_board[self._x_row + 1][self._x_column + 1] == "o":
-                if self._game_board[self._x_row + 1][self._x_column - 1] == "o":
-                    if self._game_board[self._x_row - 1][self._x_column + 1] == "o":
-                        if self._game_board[self._x_row - 1][self._x_column - 1] == "o":
-                            """Checks if all possible moves for 'x' are now blocked and if so, awards an 'o' victory"""
-                            self._game_state = "O_WON"
-            return True
-
+        if not self.available_move_o(initial_o_row, initial_o_column, new_o_row, new_o_column):
+            return False
+        self._o_board ^= (1 << initial_o_row * _SIZE + initial_o_column) | (1 << new_o_row * _SIZE + new_o_column)
+        trap = _TRAP_MASKS[self._x_row * _SIZE + self._x_column]
+        if self._o_board & trap == trap:
+            # All possible moves for 'x' are now blocked, so 'o' wins. On the edge fewer 'o's are needed.
+            self._game_state = "O_WON"
+        return True
 
     def print_game_board(self):
-        print(self._game_board)
+        board = [["_"] * _SIZE for _ in range(_SIZE)]
+        for row, column in self.get_o_positions():
+            board[row][column] = "o"
+        board[self._x_row][self._x_column] = "x"
+        print(board)
 
     def print_game_state(self):
         print(self._game_state)
@@ -0,0 +1,174 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Plays large numbers of FBoard games at once with NumPy and reports how they ended.
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+# Row and column steps of the moves in FBoard.available_move_x and available_move_o. A policy picks an 'x' move by
+# its step's index, and an 'o' move by piece * 3 + the step's index, with pieces in the order of the 'o' arrays.
+X_STEPS = np.array([(1, 1), (1, -1), (-1, 1), (-1, -1)], dtype=np.int8)
+O_STEPS = np.array([(1, -1), (-1, 1), (-1, -1)], dtype=np.int8)
+
+_SIZE = 8
+_STARTING_O = np.array([5 * _SIZE + 7, 6 * _SIZE + 6, 7 * _SIZE + 5, 7 * _SIZE + 7], dtype=np.int64)
+_GOAL = _SIZE * _SIZE - 1
+
+
+def _build_targets(steps):
+    """Returns two arrays of shape (64, len(steps)) holding, for every square numbered row * 8 + column, the square
+    each step reaches (0 if it is off the board) and whether it is on the board."""
+    targets = np.zeros((_SIZE * _SIZE, len(steps)), dtype=np.int64)
+    on_board = np.zeros((_SIZE * _SIZE, len(steps)), dtype=bool)
+    for square in range(_SIZE * _SIZE):
+        row, column = divmod(square, _SIZE)
+        for i, (row_step, column_step) in enumerate(steps):
+            if 0 <= row + row_step < _SIZE and 0 <= column + column_step < _SIZE:
+                targets[square, i] = (row + row_step) * _SIZE + column + column_step
+                on_board[square, i] = True
+    return targets, on_board
+
+
+_X_TARGETS, _X_ON_BOARD = _build_targets(X_STEPS.tolist())
+_O_TARGETS, _O_ON_BOARD = _build_targets(O_STEPS.tolist())
+# Bitmask of the squares diagonal to each square that are on the board: four, or fewer along the edge
+_TRAP_MASKS = np.array([np.bitwise_or.reduce(np.left_shift(1, _X_TARGETS[square][_X_ON_BOARD[square]]))
+                        for square in range(_SIZE * _SIZE)], dtype=np.int64)
+
+# Codes for how a game ended.
+UNFINISHED = 0
+X_WON = 1
+O_WON = 2
+
+
+def random_policy(x_rows, x_columns, o_rows, o_columns, legal, rng):
+    """Policy that picks one of the legal moves in each game uniformly at random.
+
+    Every policy takes the positions of the games where it is to move: 'x' rows and columns of shape (n,), 'o' rows
+    and columns of shape (n, 4), a bool array 'legal' of shape (n, 4) for 'x' or (n, 12) for 'o' marking the legal
+    moves (see X_STEPS and O_STEPS), and the NumPy random Generator. It returns an int array of shape (n,) holding
+    the move to make in each game. Games with no legal move are lost whatever is picked for them."""
+    return np.argmax(rng.random(legal.shape) * legal, axis=1)
+
+
+def _pick(policy, x_rows, x_columns, o_rows, o_columns, legal, rng):
+    """Runs a policy and returns its moves, with a flag for each game of whether it had no legal move. Raises
+    ValueError if the policy picks an illegal move in a game that has a legal one."""
+    stuck = ~legal.any(axis=1)
+    moves = np.asarray(policy(x_rows, x_columns, o_rows, o_columns, legal, rng), dtype=np.intp)
+    moves = np.where(stuck, 0, moves)
+    if not legal[np.arange(len(moves)), moves][~stuck].all():
+        raise ValueError("The policy picked an illegal move.")
+    return moves, stuck
+
+
+def _play_batch(games, x_policy, o_policy, max_plies, rng):
+    """Plays 'games' games to the end or to 'max_plies' plies, and returns arrays of each game's result code and the
+    number of plies it lasted. Only the games still going are kept in the working arrays, as squares numbered
+    row * 8 + column with the 'o' pieces also kept as a bitmask of squares."""
+    results = np.full(games, UNFINISHED, dtype=np.int8)
+    plies = np.full(games, max_plies, dtype=np.int32)
+    game_numbers = np.arange(games)
+    x_squares = np.zeros(games, dtype=np.int64)
+    o_squares = np.tile(_STARTING_O, (games, 1))
+    o_boards = np.full(games, np.bitwise_or.reduce(np.left_shift(1, _STARTING_O)), dtype=np.int64)
+
+    for ply in range(max_plies):
+        if not len(game_numbers):
+            break
+        games_left = np.arange(len(game_numbers))
+        x_rows, x_columns = np.divmod(x_squares, _SIZE)
+        o_rows, o_columns = np.divmod(o_squares, _SIZE)
+        ended = np.zeros(len(game_numbers), dtype=np.int8)
+
+        if ply % 2 == 0:
+            targets = _X_TARGETS[x_squares]
+            legal = _X_ON_BOARD[x_squares] & ((o_boards[:, None] >> targets) & 1 == 0)
+            moves, stuck = _pick(x_policy, x_rows, x_columns, o_rows, o_columns, legal, rng)
+            x_squares = np.where(stuck, x_squares, targets[games_left, moves])
+            ended[x_squares == _GOAL] = X_WON
+            # A player with no legal move loses
+            ended[stuck] = O_WON
+        else:
+            targets = _O_TARGETS[o_squares].reshape(len(game_numbers), -1)
+            blocked = o_boards | np.left_shift(1, x_squares)
+            legal = _O_ON_BOARD[o_squares].reshape(len(game_numbers), -1) & ((blocked[:, None] >> targets) & 1 == 0)
+            moves, stuck = _pick(o_policy, x_rows, x_columns, o_rows, o_columns, legal, rng)
+            pieces = moves // len(O_STEPS)
+            old_squares = o_squares[games_left, pieces]
+            new_squares = np.where(stuck, old_squares, targets[games_left, moves])
+            o_squares[games_left, pieces] = new_squares
+            o_boards ^= np.left_shift(1, old_squares) ^ np.left_shift(1, new_squares)
+            # 'o' wins by filling every square diagonal to 'x' that is on the board
+            traps = _TRAP_MASKS[x_squares]
+            ended[o_boards & traps == traps] = O_WON
+            ended[stuck] = X_WON
+
+        finished = ended != UNFINISHED
+        if finished.any():
+            results[game_numbers[finished]] = ended[finished]
+            plies[game_numbers[finished]] = ply + 1
+            going = ~finished
+            game_numbers = game_numbers[going]
+            x_squares = x_squares[going]
+            o_squares = o_squares[going]
+            o_boards = o_boards[going]
+    return results, plies
+
+
+def simulate(games, x_policy=None, o_policy=None, max_plies=200, batch_size=1 << 16, seed=None):
+    """Plays 'games' FBoard games from the starting position, 'batch_size' at a time, with each player's moves picked by
+    its policy (see random_policy, the default). The rules are the ones FBoardTablebase uses: 'x' moves first and the
+    players take turns, 'x' wins by reaching (7, 7), 'o' wins by filling every square diagonal to 'x' that is on the
+    board, and a player with no legal move loses. A game still going after 'max_plies' plies is counted as unfinished.
+    Returns a dictionary with the number of games, 'x' wins, 'o' wins and unfinished games, the mean number of plies in
+    finished games, the seconds taken and games per second."""
+    if x_policy is None:
+        x_policy = random_policy
+    if o_policy is None:
+        o_policy = random_policy
+    rng = np.random.default_rng(seed)
+    start = time.perf_counter()
+    counts = np.zeros(3, dtype=np.int64)
+    finished_plies = 0
+    played = 0
+    while played < games:
+        batch = min(batch_size, games - played)
+        results, plies = _play_batch(batch, x_policy, o_policy, max_plies, rng)
+        counts += np.bincount(results, minlength=3)
+        finished_plies += int(plies[results != UNFINISHED].sum())
+        played += batch
+    seconds = time.perf_counter() - start
+    finished = int(counts[X_WON] + counts[O_WON])
+    return {
+        "games": games,
+        "x_wins": int(counts[X_WON]),
+        "o_wins": int(counts[O_WON]),
+        "unfinished": int(counts[UNFINISHED]),
+        "mean_plies": finished_plies / finished if finished else 0.0,
+        "seconds": seconds,
+        "games_per_second": games / seconds if seconds > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    """Command line entry point. Plays random games and prints how they ended."""
+    parser = argparse.ArgumentParser(description="Play many random FBoard games and count the results.")
+    parser.add_argument("games", type=int, help="number of games to play")
+    parser.add_argument("--max-plies", type=int, default=200, help="plies before a game counts as unfinished")
+    parser.add_argument("--batch-size", type=int, default=1 << 16, help="games played at once")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    report = simulate(args.games, max_plies=args.max_plies, batch_size=args.batch_size, seed=args.seed)
+    print("%d games: %d x wins, %d o wins, %d unfinished, %.1f plies on average, %.2f s (%.0f games/s)" % (
+        report["games"], report["x_wins"], report["o_wins"], report["unfinished"], report["mean_plies"],
+        report["seconds"], report["games_per_second"]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
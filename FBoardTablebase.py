@@ -0,0 +1,289 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Solves every FBoard position by retrograde analysis and looks up results and best moves in the table.
+
+import argparse
+import array
+import itertools
+import sys
+import time
+
+from FBoard import FBoard
+
+# Every move is one space diagonally, so pieces never leave the squares they start on: those where row + column is
+# even. Only those 32 squares are indexed, numbered row by row.
+_SQUARES = tuple((row, column) for row in range(8) for column in range(8) if (row + column) % 2 == 0)
+_SQUARE_NUMBERS = {square: number for number, square in enumerate(_SQUARES)}
+_GOAL = _SQUARE_NUMBERS[(7, 7)]
+
+# Row and column steps of the moves in FBoard.available_move_x and available_move_o.
+_X_STEPS = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+_O_STEPS = ((1, -1), (-1, 1), (-1, -1))
+
+
+def _targets(steps):
+    """Returns, for every square number, a tuple of the square numbers one of the given steps reaches on the board."""
+    targets = []
+    for row, column in _SQUARES:
+        targets.append(tuple(_SQUARE_NUMBERS[(row + row_step, column + column_step)]
+                             for row_step, column_step in steps
+                             if 0 <= row + row_step < 8 and 0 <= column + column_step < 8))
+    return tuple(targets)
+
+
+_X_TARGETS = _targets(_X_STEPS)
+_O_TARGETS = _targets(_O_STEPS)
+# Squares an 'o' can have come from to reach each square: its moves taken backwards
+_O_SOURCES = _targets(tuple((-row_step, -column_step) for row_step, column_step in _O_STEPS))
+# Mask of the squares diagonal to each square that are on the board: four, or fewer along the edge
+_TRAP_MASKS = tuple(sum(1 << target for target in _X_TARGETS[square]) for square in range(len(_SQUARES)))
+
+# Every set of four 'o' squares as a bitmask of square numbers, and each one's position in that tuple
+_O_SETS = tuple(sum(1 << square for square in squares) for squares in itertools.combinations(range(len(_SQUARES)), 4))
+_O_SET_NUMBERS = {o_set: number for number, o_set in enumerate(_O_SETS)}
+
+STATE_COUNT = len(_O_SETS) * len(_SQUARES) * 2
+
+_FILE_MAGIC = b'FBOARDTB'
+
+
+def _state(o_set_number, x_square, o_to_move):
+    """Returns the index of a state in the tablebase."""
+    return (o_set_number * len(_SQUARES) + x_square) * 2 + o_to_move
+
+
+def _successors(o_set, x_square, o_to_move):
+    """Returns a list of (move, o set after it, x square after it) tuples for every move the player to move has.
+    Moves are in the form GameServer uses: ("x", row, column) or ("o", row, column, new_row, new_column)."""
+    successors = []
+    if o_to_move:
+        blocked = o_set | 1 << x_square
+        for square in range(len(_SQUARES)):
+            if o_set >> square & 1:
+                for target in _O_TARGETS[square]:
+                    if not blocked >> target & 1:
+                        successors.append((("o",) + _SQUARES[square] + _SQUARES[target],
+                                           o_set ^ (1 << square | 1 << target), x_square))
+    else:
+        for target in _X_TARGETS[x_square]:
+            if not o_set >> target & 1:
+                successors.append((("x",) + _SQUARES[target], o_set, target))
+    return successors
+
+
+class FBoardTablebase:
+    """The result of perfect play from every FBoard position, found by retrograde analysis.
+
+    The tablebase fills in rules FBoard leaves to its caller: the players take turns, 'x' wins by reaching (7, 7), 'o'
+    wins when every square diagonal to 'x' that is on the board holds an 'o' (as FBoard.move_o checks), and a player
+    with no legal move loses. Positions neither player can force a win from are draws. Only moves that stay on the board
+    count.
+
+    Each state is a set of four 'o' squares, the 'x' square and the player to move, and its index is calculated from
+    those, so a lookup is a single array read. Each entry is a signed 16 bit number of plies, from the point of view
+    of the player to move: n + 1 means they win in n plies, -(n + 1) means they lose in n plies, and 0 is a draw.
+    Wins are as quick as possible and losses as slow as possible. The whole table is about 4.6 MB."""
+
+    def __init__(self, values):
+        """Initializes the tablebase from an array of STATE_COUNT values (see solve and load)."""
+        if len(values) != STATE_COUNT:
+            raise ValueError("A tablebase has %d states, not %d." % (STATE_COUNT, len(values)))
+        self._values = values
+
+    @classmethod
+    def solve(cls):
+        """Returns a new tablebase, solved from scratch. Every position is resolved, working backwards one ply at a
+        time from the positions where the game is over. Takes around ten seconds."""
+        values = array.array('h', bytes(2 * STATE_COUNT))
+        # Moves left before a position whose moves all win for the opponent is a loss
+        moves_left = bytearray(STATE_COUNT)
+        frontier = []
+        square_count = len(_SQUARES)
+
+        for o_set_number, o_set in enumerate(_O_SETS):
+            for x_square in range(square_count):
+                if o_set >> x_square & 1:
+                    continue
+                state = _state(o_set_number, x_square, 0)
+                trap = _TRAP_MASKS[x_square]
+                if x_square == _GOAL:
+                    # 'x' has won
+                    values[state] = 1
+                    values[state + 1] = -1
+                elif o_set & trap == trap:
+                    # 'o' has won
+                    values[state] = -1
+                    values[state + 1] = 1
+                else:
+                    x_moves = 0
+                    for target in _X_TARGETS[x_square]:
+                        if not o_set >> target & 1:
+                            x_moves += 1
+                    o_moves = 0
+                    blocked = o_set | 1 << x_square
+                    for square in range(square_count):
+                        if o_set >> square & 1:
+                            for target in _O_TARGETS[square]:
+                                if not blocked >> target & 1:
+                                    o_moves += 1
+                    if x_moves:
+                        moves_left[state] = x_moves
+                    else:
+                        values[state] = -1
+                    if o_moves:
+                        moves_left[state + 1] = o_moves
+                    else:
+                        values[state + 1] = -1
+                    if x_moves and o_moves:
+                        continue
+                frontier.append(state)
+                frontier.append(state + 1)
+
+        while frontier:
+            next_frontier = []
+            for state in frontier:
+                value = values[state]
+                if not value:
+                    continue
+                o_to_move = state & 1
+                x_square = (state >> 1) % square_count
+                o_set_number = (state >> 1) // square_count
+                o_set = _O_SETS[o_set_number]
+                # Positions the previous player, who is not the player to move here, could have moved from
+                if o_to_move:
+                    predecessors = [_state(o_set_number, source, 0) for source in _X_TARGETS[x_square]
+                                    if not o_set >> source & 1]
+                else:
+                    predecessors = []
+                    blocked = o_set | 1 << x_square
+                    for square in range(square_count):
+                        if o_set >> square & 1:
+                            for source in _O_SOURCES[square]:
+                                if not blocked >> source & 1:
+                                    previous = _O_SET_NUMBERS[o_set ^ (1 << square | 1 << source)]
+                                    predecessors.append(_state(previous, x_square, 1))
+                for predecessor in predecessors:
+                    if values[predecessor]:
+                        continue
+                    if value < 0:
+                        # Moving here wins for the previous player
+                        values[predecessor] = 1 - value
+                        next_frontier.append(predecessor)
+                    else:
+                        moves_left[predecessor] -= 1
+                        if not moves_left[predecessor]:
+                            values[predecessor] = -1 - value
+                            next_frontier.append(predecessor)
+            frontier = next_frontier
+        return cls(values)
+
+    @classmethod
+    def load(cls, path):
+        """Returns the tablebase saved at 'path' by save. Raises ValueError if the file isn't a saved tablebase."""
+        values = array.array('h')
+        with open(path, 'rb') as table_file:
+            if table_file.read(len(_FILE_MAGIC)) != _FILE_MAGIC:
+                raise ValueError("Not an FBoard tablebase: " + path)
+            try:
+                values.fromfile(table_file, STATE_COUNT)
+            except EOFError:
+                raise ValueError("FBoard tablebase is too short: " + path)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return cls(values)
+
+    def save(self, path):
+        """Writes the tablebase to 'path', little endian whatever machine it was solved on."""
+        values = self._values
+        if sys.byteorder != 'little':
+            values = array.array('h', values)
+            values.byteswap()
+        with open(path, 'wb') as table_file:
+            table_file.write(_FILE_MAGIC)
+            values.tofile(table_file)
+
+    @staticmethod
+    def _read_board(board):
+        """Takes an FBoard and returns its 'o' squares as a bitmask and its 'x' square. Raises ValueError if a piece
+        is somewhere the tablebase doesn't cover."""
+        try:
+            x_square = _SQUARE_NUMBERS[(board.get_x_row(), board.get_x_column())]
+            o_set = 0
+            for position in board.get_o_positions():
+                o_set |= 1 << _SQUARE_NUMBERS[position]
+        except KeyError:
+            raise ValueError("The tablebase only covers pieces on the squares they start on.")
+        if o_set not in _O_SET_NUMBERS or o_set >> x_square & 1:
+            raise ValueError("The tablebase only covers positions with four 'o' pieces and an 'x'.")
+        return o_set, x_square
+
+    def _value(self, o_set, x_square, o_to_move):
+        """Returns the tablebase entry for a state."""
+        return self._values[_state(_O_SET_NUMBERS[o_set], x_square, o_to_move)]
+
+    def evaluate(self, board, x_to_move=True):
+        """Takes an FBoard and which player is to move, and returns a tuple of the result with perfect play ("X_WON",
+        "O_WON" or "DRAW") and the number of plies until it, or 0 for a draw. Raises ValueError if the position
+        isn't covered by the tablebase."""
+        o_set, x_square = self._read_board(board)
+        value = self._value(o_set, x_square, not x_to_move)
+        if value == 0:
+            return "DRAW", 0
+        if (value > 0) == x_to_move:
+            return "X_WON", abs(value) - 1
+        return "O_WON", abs(value) - 1
+
+    def best_move(self, board, x_to_move=True):
+        """Takes an FBoard and which player is to move, and returns the best move for that player as ("x", row,
+        column), the arguments to move_x, or ("o", row, column, new_row, new_column), the arguments to move_o. A
+        winning player picks the quickest win and a losing player the slowest loss. Returns None if the game is over
+        or the player has no legal move. Raises ValueError if the position isn't covered by the tablebase."""
+        o_set, x_square = self._read_board(board)
+        o_to_move = not x_to_move
+        trap = _TRAP_MASKS[x_square]
+        if x_square == _GOAL or o_set & trap == trap:
+            return None
+
+        best = None
+        best_score = None
+        for move, next_o_set, next_x_square in _successors(o_set, x_square, o_to_move):
+            # The opponent's value, as a score for this player where higher is better
+            value = self._value(next_o_set, next_x_square, not o_to_move)
+            if value < 0:
+                score = 2 * STATE_COUNT + value
+            elif value > 0:
+                score = -2 * STATE_COUNT + value
+            else:
+                score = 0
+            if best_score is None or score > best_score:
+                best = move
+                best_score = score
+        return best
+
+
+def main(argv=None):
+    """Command line entry point. Solves the tablebase and saves it, or loads a saved one, then prints the result of
+    the starting position with each player to move."""
+    parser = argparse.ArgumentParser(description="Solve FBoard completely and save the results.")
+    parser.add_argument("path", help="tablebase file to write, or to read with --load")
+    parser.add_argument("--load", action="store_true", help="load the tablebase instead of solving it")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if args.load:
+        tablebase = FBoardTablebase.load(args.path)
+    else:
+        tablebase = FBoardTablebase.solve()
+        tablebase.save(args.path)
+    print("%d states in %.1f s" % (STATE_COUNT, time.perf_counter() - start))
+
+    board = FBoard()
+    for x_to_move in (True, False):
+        result, plies = tablebase.evaluate(board, x_to_move)
+        print("start, %s to move: %s in %d plies, best move %s" % ('x' if x_to_move else 'o', result, plies,
+                                                                  tablebase.best_move(board, x_to_move)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,369 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Asyncio server hosting many GessGame and FBoard sessions over a JSON lines protocol, plus a load
+#              generator for measuring it.
+
+import argparse
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import random
+import sys
+import time
+
+from FBoard import FBoard
+from GessGame import GessGame
+
+
+def _play_move(game, kind, move):
+    """Takes a game, its kind ('gess' or 'fboard') and the move arguments from a request, and makes the move.
+    Returns a tuple of the move's result as a bool and the game, so it can be run in a worker process and the updated
+    game sent back. Raises ValueError for a badly formed move."""
+    if kind == 'gess':
+        if len(move) != 2:
+            raise ValueError("A Gess move is [current_center, new_center].")
+        return bool(game.make_move(str(move[0]), str(move[1]))), game
+
+    if len(move) == 3 and move[0] == 'x':
+        return bool(game.move_x(int(move[1]), int(move[2]))), game
+    if len(move) == 5 and move[0] == 'o':
+        return bool(game.move_o(int(move[1]), int(move[2]), int(move[3]), int(move[4]))), game
+    raise ValueError('An FBoard move is ["x", row, column] or ["o", row, column, new_row, new_column].')
+
+
+def _play_move_in_worker(game, kind, move):
+    """Runs _play_move in a worker process and returns its result and game along with the CPU seconds it took, which
+    the server can't see otherwise."""
+    start = time.process_time()
+    result, game = _play_move(game, kind, move)
+    return result, game, time.process_time() - start
+
+
+class _Session:
+    """One hosted game, with the connections subscribed to its updates."""
+
+    def __init__(self, session_id, kind, bot):
+        """Initializes a new game of the given kind ('gess' or 'fboard'). Bot sessions have their moves made in the
+        server's worker pool."""
+        self.session_id = session_id
+        self.kind = kind
+        self.bot = bot
+        if kind == 'gess':
+            self.game = GessGame()
+        else:
+            self.game = FBoard()
+        self.subscribers = set()
+        self.lock = asyncio.Lock()
+
+    def describe(self):
+        """Returns a dictionary describing the game's current state."""
+        description = {"session": self.session_id, "game": self.kind, "state": self.game.get_game_state()}
+        if self.kind == 'gess':
+            description["player"] = self.game.get_current_player()
+        else:
+            description["x"] = [self.game.get_x_row(), self.game.get_x_column()]
+        return description
+
+
+class GameServer:
+    """Hosts any number of in-memory GessGame and FBoard sessions for clients connected over TCP. Every request and
+    response is one line of JSON. Requests have an "op" and may have an "id", which is copied into the response:
+
+        {"op": "create", "game": "gess" or "fboard", "bot": false}  ->  {"ok": true, "session": 1, ...}
+        {"op": "move", "session": 1, "move": ["c3", "c4"]}         ->  {"ok": true, "result": true, ...}
+        {"op": "state", "session": 1}
+        {"op": "legal_moves", "session": 1}                         (Gess only)
+        {"op": "subscribe", "session": 1} / {"op": "unsubscribe", "session": 1}
+        {"op": "close", "session": 1}
+        {"op": "stats"}                                             ->  {"ok": true, "sessions": 1, "cpu_seconds": ...}
+
+    FBoard moves are ["x", row, column] for move_x or ["o", row, column, new_row, new_column] for move_o. After
+    every move that is made, subscribers get {"event": "update", "move": [...], ...} with the new state. Moves in
+    bot sessions are made in a pool of worker processes so bots searching or playing fast don't hold up the event
+    loop. Each session only makes one move at a time. The "stats" op reports the CPU time the server has used (see
+    get_cpu_seconds), which the load generator measures sessions per core with."""
+
+    def __init__(self, host='127.0.0.1', port=0, workers=None):
+        """Initializes the server to listen on the given host and port (0 picks a free port) and use the given number
+        of worker processes for bot sessions (defaults to the number of CPUs)."""
+        self._host = host
+        self._port = port
+        self._workers = workers or os.cpu_count() or 1
+        self._sessions = {}
+        self._session_ids = itertools.count(1)
+        self._pool = None
+        self._server = None
+        self._connections = set()
+        self._worker_cpu_seconds = 0.0
+
+    def get_port(self):
+        """Returns the port the server is listening on, once started."""
+        return self._port
+
+    def get_session_count(self):
+        """Returns the number of sessions being hosted."""
+        return len(self._sessions)
+
+    def get_cpu_seconds(self):
+        """Returns the CPU seconds the server has used: all of this process's, plus the time worker processes spent
+        making moves for bot sessions."""
+        return time.process_time() + self._worker_cpu_seconds
+
+    async def start(self):
+        """Starts listening for connections."""
+        self._pool = concurrent.futures.ProcessPoolExecutor(self._workers)
+        self._server = await asyncio.start_server(self._handle_connection, self._host, self._port)
+        self._port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stops listening, closes the worker pool and drops every session."""
+        if self._server is not None:
+            self._server.close()
+            for connection in list(self._connections):
+                connection.cancel()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._sessions.clear()
+
+    async def serve_forever(self):
+        """Starts the server and runs until cancelled."""
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.stop()
+
+    async def _handle_connection(self, reader, writer):
+        """Reads requests from one connection until it closes or the server stops, writing a response to each."""
+        subscriptions = set()
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                request = None
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("A request must be a JSON object.")
+                    response = await self._handle_request(request, writer, subscriptions)
+                except (ValueError, KeyError, TypeError, IndexError) as error:
+                    response = {"ok": False, "error": str(error)}
+                    if isinstance(request, dict) and "id" in request:
+                        response["id"] = request["id"]
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            # The client went away or the server is stopping
+            pass
+        finally:
+            self._connections.discard(connection)
+            for session_id in subscriptions:
+                session = self._sessions.get(session_id)
+                if session is not None:
+                    session.subscribers.discard(writer)
+            writer.close()
+
+    def _get_session(self, request):
+        """Returns the session a request names, raising ValueError if there isn't one."""
+        session = self._sessions.get(request.get("session"))
+        if session is None:
+            raise ValueError("No such session: " + str(request.get("session")))
+        return session
+
+    async def _handle_request(self, request, writer, subscriptions):
+        """Carries out one request and returns the response to send back."""
+        op = request.get("op")
+        if op == "create":
+            kind = request.get("game", "gess")
+            if kind != 'gess' and kind != 'fboard':
+                raise ValueError("Unknown game: " + str(kind))
+            session = _Session(next(self._session_ids), kind, bool(request.get("bot", False)))
+            self._sessions[session.session_id] = session
+            response = session.describe()
+        elif op == "move":
+            response = await self._move(self._get_session(request), request.get("move"))
+        elif op == "state":
+            response = self._get_session(request).describe()
+        elif op == "legal_moves":
+            session = self._get_session(request)
+            if session.kind != 'gess':
+                raise ValueError("legal_moves is only available for Gess sessions.")
+            response = session.describe()
+            response["moves"] = [list(move.centers()) for move in session.game.legal_moves()]
+        elif op == "subscribe":
+            session = self._get_session(request)
+            session.subscribers.add(writer)
+            subscriptions.add(session.session_id)
+            response = session.describe()
+        elif op == "unsubscribe":
+            session = self._get_session(request)
+            session.subscribers.discard(writer)
+            subscriptions.discard(session.session_id)
+            response = session.describe()
+        elif op == "close":
+            session = self._sessions.pop(self._get_session(request).session_id)
+            response = {"session": session.session_id, "closed": True}
+        elif op == "stats":
+            response = {"sessions": len(self._sessions), "cpu_seconds": self.get_cpu_seconds()}
+        else:
+            raise ValueError("Unknown op: " + str(op))
+
+        response["ok"] = True
+        if "id" in request:
+            response["id"] = request["id"]
+        return response
+
+    async def _move(self, session, move):
+        """Makes a move in a session, in the worker pool for bot sessions, and sends the update to subscribers."""
+        if not isinstance(move, list):
+            raise ValueError("A move must be a list.")
+        async with session.lock:
+            if session.bot:
+                loop = asyncio.get_running_loop()
+                result, session.game, cpu_seconds = await loop.run_in_executor(
+                    self._pool, _play_move_in_worker, session.game, session.kind, move)
+                self._worker_cpu_seconds += cpu_seconds
+            else:
+                result, session.game = _play_move(session.game, session.kind, move)
+        response = session.describe()
+        response["result"] = result
+        if result and session.subscribers:
+            update = dict(response)
+            update["event"] = "update"
+            update["move"] = move
+            line = json.dumps(update).encode() + b'\n'
+            for subscriber in list(session.subscribers):
+                if subscriber.is_closing():
+                    session.subscribers.discard(subscriber)
+                else:
+                    subscriber.write(line)
+        return response
+
+
+async def _request(reader, writer, request):
+    """Sends one request and returns the decoded response, skipping any subscription updates in between."""
+    writer.write(json.dumps(request).encode() + b'\n')
+    await writer.drain()
+    while True:
+        response = json.loads(await reader.readline())
+        if "event" not in response:
+            return response
+
+
+async def _play_session(host, port, moves, bot, seed, latencies):
+    """Load generator client: creates a Gess session and plays up to 'moves' random legal moves in it, adding the
+    seconds each move request took to 'latencies'."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        session = (await _request(reader, writer, {"op": "create", "game": "gess", "bot": bot}))["session"]
+        for _ in range(moves):
+            legal = (await _request(reader, writer, {"op": "legal_moves", "session": session}))["moves"]
+            if not legal:
+                break
+            start = time.perf_counter()
+            response = await _request(reader, writer, {"op": "move", "session": session, "move": rng.choice(legal)})
+            latencies.append(time.perf_counter() - start)
+            if response["state"] != "UNFINISHED":
+                break
+        await _request(reader, writer, {"op": "close", "session": session})
+    finally:
+        writer.close()
+
+
+async def _server_cpu_seconds(host, port):
+    """Asks the server at 'host' and 'port' how many CPU seconds it has used."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return (await _request(reader, writer, {"op": "stats"}))["cpu_seconds"]
+    finally:
+        writer.close()
+
+
+async def run_load(host=None, port=None, sessions=100, moves=20, bot=False, workers=None, seed=0):
+    """Runs 'sessions' concurrent clients, each playing up to 'moves' random legal moves in its own Gess session.
+    Starts a server in this process if no port is given. Returns a dictionary with the number of sessions and moves,
+    the seconds taken, moves per second, the p50 and p99 move latency in milliseconds, the server's CPU milliseconds
+    per move, and sessions per core: how many sessions playing at the pace these did one fully busy core would
+    keep up with, from the CPU time the server reports using during the run. A server in this process shares its CPU
+    time with the clients, which makes both CPU figures pessimistic; give a port to measure a separate server."""
+    server = None
+    if port is None:
+        server = GameServer(workers=workers)
+        await server.start()
+        host = '127.0.0.1'
+        port = server.get_port()
+    latencies = []
+    start = time.perf_counter()
+    try:
+        cpu_start = await _server_cpu_seconds(host, port)
+        await asyncio.gather(*[_play_session(host, port, moves, bot, seed + i, latencies) for i in range(sessions)])
+        cpu_seconds = await _server_cpu_seconds(host, port) - cpu_start
+    finally:
+        if server is not None:
+            await server.stop()
+    seconds = time.perf_counter() - start
+
+    latencies.sort()
+
+    def percentile(fraction):
+        """Returns the latency in milliseconds at the given fraction of the sorted latencies."""
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))] * 1000
+
+    return {
+        "sessions": sessions,
+        "moves": len(latencies),
+        "seconds": seconds,
+        "moves_per_second": len(latencies) / seconds if seconds > 0 else 0.0,
+        "p50_ms": percentile(0.50),
+        "p99_ms": percentile(0.99),
+        "cpu_ms_per_move": cpu_seconds / len(latencies) * 1000 if latencies else 0.0,
+        "sessions_per_core": sessions * seconds / cpu_seconds if cpu_seconds > 0 else 0.0
+    }
+
+
+def main(argv=None):
+    """Command line entry point: 'serve' runs the server, 'load' runs the load generator."""
+    parser = argparse.ArgumentParser(description="Host Gess and FBoard games, or measure a server under load.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="run the game server")
+    serve.add_argument("--host", default='127.0.0.1')
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=int, default=None, help="worker processes for bot sessions")
+    load = commands.add_parser("load", help="run the load generator")
+    load.add_argument("--host", default='127.0.0.1')
+    load.add_argument("--port", type=int, default=None, help="server to load (default: start one in this process)")
+    load.add_argument("--sessions", type=int, default=100)
+    load.add_argument("--moves", type=int, default=20, help="moves per session")
+    load.add_argument("--bot", action="store_true", help="make the sessions bot sessions")
+    load.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            asyncio.run(GameServer(args.host, args.port, args.workers).serve_forever())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
+    report = asyncio.run(run_load(args.host, args.port, args.sessions, args.moves, args.bot, args.workers))
+    print("%d sessions, %d moves in %.2f s (%.0f moves/s), p50 %.2f ms, p99 %.2f ms, %.2f CPU ms per move, "
+          "%.1f sessions per core" % (report["sessions"], report["moves"], report["seconds"],
+                                      report["moves_per_second"], report["p50_ms"], report["p99_ms"],
+                                      report["cpu_ms_per_move"], report["sessions_per_core"]))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Opt-in call counts, timings and move rejection reasons for GessGame, with text export for monitoring.
+
+import collections
+import functools
+import time
+
+import GessGame as _gess_module
+
+# GessGame methods that are counted and timed while instrumentation is enabled.
+INSTRUMENTED_METHODS = ('is_valid_move', 'create_footprint', 'obstruction_check', 'ring_check', 'edge_removal',
+                        'make_move')
+
+# The original methods while they are replaced by timed wrappers, otherwise empty.
+_originals = {}
+# [call count, cumulative seconds] for each instrumented method, kept from one enable() to the next until reset().
+_calls = {name: [0, 0.0] for name in INSTRUMENTED_METHODS}
+_rejections = collections.Counter()
+
+
+def _timed(name, method):
+    """Returns a wrapper around a GessGame method that adds each call and the time it took to the method's totals."""
+    totals = _calls[name]
+    perf_counter = time.perf_counter
+
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            totals[0] += 1
+            totals[1] += perf_counter() - start
+
+    return timed
+
+
+def enable():
+    """Starts counting and timing calls to the INSTRUMENTED_METHODS of every GessGame in this process, and counting
+    rejected moves by reason. Does nothing if instrumentation is already enabled.
+
+    The methods are replaced on the class by timed wrappers, so while instrumentation is disabled GessGame runs its
+    own methods and pays nothing for it. Times include the methods a method calls, so make_move's time includes
+    is_valid_move's."""
+    if _originals:
+        return
+    for name in INSTRUMENTED_METHODS:
+        method = _gess_module.GessGame.__dict__[name]
+        _originals[name] = method
+        setattr(_gess_module.GessGame, name, _timed(name, method))
+    _gess_module._rejection_counts = _rejections
+
+
+def disable():
+    """Stops counting and puts GessGame's own methods back. The totals are kept."""
+    for name, method in _originals.items():
+        setattr(_gess_module.GessGame, name, method)
+    _originals.clear()
+    _gess_module._rejection_counts = None
+
+
+def is_enabled():
+    """Returns True if instrumentation is enabled."""
+    return bool(_originals)
+
+
+def reset():
+    """Sets every total back to zero."""
+    for totals in _calls.values():
+        totals[0] = 0
+        totals[1] = 0.0
+    _rejections.clear()
+
+
+def snapshot():
+    """Returns a dictionary of the totals so far: whether instrumentation is enabled, a dictionary for each
+    instrumented method of its call count and cumulative seconds, and the number of moves rejected for each reason.
+    Rejection reasons are the names passed to GessGame's _rejected, for example "obstructed" or "suicide"."""
+    return {
+        "enabled": is_enabled(),
+        "calls": {name: {"count": totals[0], "seconds": totals[1]} for name, totals in _calls.items()},
+        "rejections": dict(_rejections)
+    }
+
+
+def to_prometheus(prefix='gess'):
+    """Returns the totals as text in the Prometheus exposition format, with each metric name starting with
+    'prefix'."""
+    lines = [
+        "# HELP %s_calls_total Calls to GessGame methods while instrumented." % prefix,
+        "# TYPE %s_calls_total counter" % prefix
+    ]
+    for name, totals in _calls.items():
+        lines.append('%s_calls_total{method="%s"} %d' % (prefix, name, totals[0]))
+    lines.append("# HELP %s_call_seconds_total Seconds spent in GessGame methods, including the methods they call."
+                 % prefix)
+    lines.append("# TYPE %s_call_seconds_total counter" % prefix)
+    for name, totals in _calls.items():
+        lines.append('%s_call_seconds_total{method="%s"} %r' % (prefix, name, totals[1]))
+    lines.append("# HELP %s_rejected_moves_total Moves rejected, by reason." % prefix)
+    lines.append("# TYPE %s_rejected_moves_total counter" % prefix)
+    for reason, count in sorted(_rejections.items()):
+        lines.append('%s_rejected_moves_total{reason="%s"} %d' % (prefix, reason, count))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,249 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Computer player for GessGame that picks moves with a Monte Carlo tree search, optionally run in
+#              parallel across a pool of processes.
+
+import concurrent.futures
+import math
+import os
+import random
+import time
+
+from AlphaBetaPlayer import make_evaluation
+from GessGame import GessGame
+
+# Ways of picking moves in a playout: 'sampled' uses GessGame.random_move, which is quick but doesn't pick every
+# move equally often, and 'uniform' picks evenly from legal_moves().
+PLAYOUT_POLICIES = ('sampled', 'uniform')
+
+
+class _Node:
+    """A position in the search tree, reached by 'move' from its parent. 'score' is the total playout result for the
+    player who made that move: 1 for each win, 0.5 for each draw."""
+
+    __slots__ = ('move', 'parent', 'children', 'untried', 'visits', 'score')
+
+    def __init__(self, move, parent):
+        self.move = move
+        self.parent = parent
+        self.children = []
+        self.untried = None  # the moves not yet expanded, listed the first time the node is expanded
+        self.visits = 0
+        self.score = 0.0
+
+
+def _search(task):
+    """Takes a tuple of (packed position, board size, playout budget or None, seconds or None, seed, exploration
+    constant, playout depth, playout policy, evaluation or None for the default) and grows a search tree from the
+    position until the budget or time runs out. Returns a tuple of (dictionary from root move to (visits, score),
+    playouts run). Runs in the worker processes for root parallelism, each with its own seed, so their trees are
+    independent."""
+    position, size, playouts, seconds, seed, exploration, playout_depth, policy, evaluation = task
+    if evaluation is None:
+        evaluation = make_evaluation()
+    deadline = None if seconds is None else time.perf_counter() + seconds
+    rng = random.Random(seed)
+    game = GessGame.from_bytes(position, size)
+    root = _Node(None, None)
+    done = 0
+
+    while (playouts is None or done < playouts) and (deadline is None or time.perf_counter() < deadline):
+        node = root
+        pushed = 0
+
+        # Selection: follow the children with the best upper confidence bound while the node is fully expanded
+        while node.untried is not None and not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            best = None
+            best_bound = -1.0
+            for child in node.children:
+                bound = child.score / child.visits + exploration * math.sqrt(log_visits / child.visits)
+                if bound > best_bound:
+                    best = child
+                    best_bound = bound
+            node = best
+            game.push_move(node.move)
+            pushed += 1
+
+        # Expansion: add one untried move, listing the node's moves the first time it is expanded
+        if node.untried is None:
+            node.untried = list(game.legal_moves())
+        if node.untried:
+            move = node.untried.pop(rng.randrange(len(node.untried)))
+            child = _Node(move, node)
+            node.children.append(child)
+            node = child
+            game.push_move(move)
+            pushed += 1
+
+        # Playout: play on until the game ends or playout_depth moves, then score the position
+        winner = None
+        for _ in range(playout_depth):
+            if game.get_game_state() != "UNFINISHED":
+                break
+            if policy == 'uniform':
+                moves = list(game.legal_moves())
+                move = rng.choice(moves) if moves else None
+            else:
+                move = game.random_move(rng)
+            if move is None:
+                # A player who can't move has lost
+                winner = 'O' if game.get_current_player() == 'X' else 'X'
+                break
+            game.push_move(move)
+            pushed += 1
+        if winner is None:
+            winner = game.get_winner()
+        if winner is None and game.get_game_state() == "UNFINISHED":
+            player = game.get_current_player()
+            score = evaluation(game)
+            if score > 0:
+                winner = player
+            elif score < 0:
+                winner = 'O' if player == 'X' else 'X'
+        for _ in range(pushed):
+            game.pop_move()
+
+        # Backpropagation: score each node for the player who made the move leading to it
+        mover = 'O' if game.get_current_player() == 'X' else 'X'
+        depth = 0
+        path = []
+        while node is not None:
+            path.append(node)
+            node = node.parent
+        for node in reversed(path):
+            node.visits += 1
+            if depth > 0:
+                if winner is None:
+                    node.score += 0.5
+                elif winner == mover:
+                    node.score += 1.0
+            mover = 'O' if mover == 'X' else 'X'
+            depth += 1
+        done += 1
+
+    return {child.move: (child.visits, child.score) for child in root.children}, done
+
+
+class MCTSPlayer:
+    """Picks moves for whichever player's turn it is in a GessGame with a Monte Carlo tree search (UCT). Each
+    playout plays random moves with the game's own rules until the game ends or a depth limit, where the position is
+    scored as a win, loss or draw by the sign of an evaluation (see AlphaBetaPlayer.make_evaluation).
+
+    With more than one worker the search uses root parallelism: each worker process grows its own tree from the
+    same position with a different seed, and the visit counts and scores of the root moves are added together. The
+    move picked is the one visited most."""
+
+    def __init__(self, playouts=None, time_limit=1.0, workers=1, exploration=1.4, playout_depth=40,
+                 playout_policy='sampled', evaluation=None, seed=None, book=None):
+        """Initializes the player. 'playouts' is the total playout budget per move, split between the workers, and
+        'time_limit' is in seconds; either can be None for no limit, but not both. 'workers' is the number of
+        processes to search in (None for the number of CPUs). 'playout_policy' is one of PLAYOUT_POLICIES.
+        'evaluation' scores a position for the player to move when a playout stops early (None for
+        make_evaluation()), and must be picklable, such as a module level function, to use more than one worker.
+        'seed' makes the searches repeatable when there is no time limit. 'book' is an OpeningBook to take moves from,
+        when it has one, instead of searching."""
+        if playouts is None and time_limit is None:
+            raise ValueError("An MCTSPlayer needs a playout budget, a time limit or both.")
+        if playout_policy not in PLAYOUT_POLICIES:
+            raise ValueError("Unknown playout policy: " + str(playout_policy))
+        self._playouts = playouts
+        self._time_limit = time_limit
+        self._workers = workers or os.cpu_count() or 1
+        self._exploration = exploration
+        self._playout_depth = playout_depth
+        self._playout_policy = playout_policy
+        self._evaluation = evaluation
+        self._rng = random.Random(seed)
+        self._book = book
+        self._pool = None
+        self._last_search = {}
+
+    def close(self):
+        """Shuts down the worker processes, if any were started."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def get_last_search_info(self):
+        """Returns a dictionary describing the most recent search: the move picked, whether it came from the opening
+        book, its visits and its win rate for the player who moved, the playouts run, the workers used, the seconds
+        taken and the playouts per second."""
+        return self._last_search
+
+    def choose_move(self, game):
+        """Takes a GessGame and returns the move to make for the player whose turn it is, as a Move (see
+        GessGame.legal_moves) that can be passed to make_move. Returns None if the game is over or there is no
+        legal move. The game isn't changed."""
+        start = time.perf_counter()
+        best_move = None
+        visits = 0
+        score = 0.0
+        playouts = 0
+        book_move = None
+        if self._book is not None:
+            book_move = self._book.choose_move(game)
+        if book_move is not None:
+            best_move = book_move
+        elif game.get_game_state() == "UNFINISHED":
+            moves = list(game.legal_moves())
+            if len(moves) == 1:
+                best_move = moves[0]
+            elif moves:
+                totals, playouts = self._run_searches(game)
+                for move, (move_visits, move_score) in totals.items():
+                    if move_visits > visits:
+                        best_move = move
+                        visits = move_visits
+                        score = move_score
+                if best_move is None:
+                    best_move = moves[0]
+
+        seconds = time.perf_counter() - start
+        self._last_search = {
+            "move": best_move,
+            "book": book_move is not None,
+            "visits": visits,
+            "win_rate": score / visits if visits else 0.0,
+            "playouts": playouts,
+            "workers": self._workers,
+            "seconds": seconds,
+            "playouts_per_second": playouts / seconds if seconds > 0 else 0.0
+        }
+        return best_move
+
+    def _run_searches(self, game):
+        """Runs a search in each worker and returns a tuple of (dictionary from root move to total (visits, score),
+        total playouts run)."""
+        position = game.to_bytes()
+        size = game.get_board_size()
+        tasks = []
+        for worker in range(self._workers):
+            if self._playouts is None:
+                budget = None
+            else:
+                budget = self._playouts // self._workers + (worker < self._playouts % self._workers)
+            tasks.append((position, size, budget, self._time_limit, self._rng.getrandbits(64), self._exploration,
+                          self._playout_depth, self._playout_policy, self._evaluation))
+
+        if self._workers == 1:
+            results = [_search(tasks[0])]
+        else:
+            if self._pool is None:
+                self._pool = concurrent.futures.ProcessPoolExecutor(self._workers)
+            results = list(self._pool.map(_search, tasks))
+
+        totals = {}
+        playouts = 0
+        for root_moves, done in results:
+            playouts += done
+            for move, (visits, score) in root_moves.items():
+                total_visits, total_score = totals.get(move, (0, 0.0))
+                totals[move] = (total_visits + visits, total_score + score)
+        return totals, playouts
@@ -0,0 +1,236 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Opening book for GessGame bots: how each move played in the first plies of recorded games turned out,
+#              keyed by position hash and saved to a file.
+
+import argparse
+import os
+import random
+import struct
+import sys
+import time
+
+from BatchReplayer import iter_positions
+from GessGame import GessGame, Move
+
+# The file starts with a header of its magic bytes, the board size, the number of plies the book covers and the
+# number of records. Each record is a position hash, a move (see GessGame.Move), the games the move was played in,
+# the games the player who made it went on to win, and the games that ended without a winner.
+_MAGIC = b'GESSBOOK'
+_HEADER = struct.Struct('<8sQQQ')
+_RECORD = struct.Struct('<QQIII')
+
+
+class OpeningBook:
+    """Statistics for the moves played in the first 'max_plies' plies of a collection of games, from archives (see
+    BatchReplayer.parse_game) or self-play. Entries are keyed by GessGame.get_position_hash(), so a position reached
+    through a different order of moves shares its entry. For each move the book keeps the number of games it was
+    played in, how many the player who made it won and how many ended without a winner (draws, and games that stopped
+    before finishing).
+
+    Bots consult the book before searching (see AlphaBetaPlayer and MCTSPlayer), so the early positions every game
+    passes through are looked up instead of searched again each time."""
+
+    def __init__(self, max_plies=16, size=20):
+        """Initializes an empty book covering the first 'max_plies' plies of games on a board with 'size' rows and
+        columns."""
+        if max_plies < 1:
+            raise ValueError("An opening book needs to cover at least one ply.")
+        self._max_plies = max_plies
+        self._size = size
+        self._start_hash = GessGame(size).get_position_hash()
+        # position hash -> {Move: [games, wins, draws]}
+        self._positions = {}
+
+    def __len__(self):
+        """Returns the number of positions in the book."""
+        return len(self._positions)
+
+    def get_max_plies(self):
+        """Returns the number of plies from the start of a game the book covers."""
+        return self._max_plies
+
+    def get_board_size(self):
+        """Returns the number of rows (and of columns) on the board the book is for."""
+        return self._size
+
+    def _add_line(self, line, winner):
+        """Takes a list of (position hash, Move, player who made it) for the first plies of a game and the game's
+        winner ('X', 'O' or None), and adds the game to every move's statistics."""
+        for position_hash, move, player in line[:self._max_plies]:
+            stats = self._positions.setdefault(position_hash, {}).setdefault(move, [0, 0, 0])
+            stats[0] += 1
+            if winner is None:
+                stats[2] += 1
+            elif winner == player:
+                stats[1] += 1
+
+    def add_game(self, moves, winner=None):
+        """Takes a game's moves, as (current_center, new_center) tuples or Moves, and the player who won it ('X', 'O'
+        or None for no winner), and adds the moves in the book's plies to the statistics. Raises ValueError if a move
+        is illegal, without adding anything."""
+        game = GessGame(self._size)
+        line = []
+        for move in moves[:self._max_plies]:
+            if not isinstance(move, int):
+                move = Move(move[0], move[1])
+            position_hash = game.get_position_hash()
+            player = game.get_current_player()
+            if not game.make_move(move):
+                raise ValueError("Illegal move in game: " + str(move))
+            line.append((position_hash, Move.from_int(move), player))
+        self._add_line(line, winner)
+
+    def add_archive(self, path):
+        """Adds every game in the move log at 'path' to the book, using the state each game ended in for its result.
+        Games are read one move at a time (see BatchReplayer.iter_positions), stopping at a game's first illegal
+        move. Returns the number of games added."""
+        games = 0
+        current_number = None
+        line = []
+        last_game = None
+        position_hash = self._start_hash
+        for game_number, move, game in iter_positions(path, self._size):
+            if game_number != current_number:
+                if current_number is not None:
+                    self._add_line(line, last_game.get_winner())
+                    games += 1
+                current_number = game_number
+                line = []
+                position_hash = self._start_hash
+            if len(line) < self._max_plies:
+                # Black moves first and the players take turns
+                player = 'X' if len(line) % 2 == 0 else 'O'
+                line.append((position_hash, move, player))
+            position_hash = game.get_position_hash()
+            last_game = game
+        if current_number is not None:
+            self._add_line(line, last_game.get_winner())
+            games += 1
+        return games
+
+    def add_self_play(self, games, player=None, max_moves=200, seed=None):
+        """Plays 'games' games from the starting position and adds them to the book. 'player' picks every move for
+        both sides through its choose_move(game) method (for example an MCTSPlayer); by default moves are picked at
+        random with GessGame.random_move, seeded with 'seed'. A player left without a legal move loses, and a game
+        still going after 'max_moves' moves has no winner. Returns the number of moves played."""
+        rng = random.Random(seed)
+        played = 0
+        for _ in range(games):
+            game = GessGame(self._size)
+            line = []
+            winner = None
+            for _ in range(max_moves):
+                if game.get_game_state() != "UNFINISHED":
+                    break
+                if player is None:
+                    move = game.random_move(rng)
+                else:
+                    move = player.choose_move(game)
+                mover = game.get_current_player()
+                if move is None:
+                    winner = 'O' if mover == 'X' else 'X'
+                    break
+                if not isinstance(move, int):
+                    move = Move(move[0], move[1])
+                position_hash = game.get_position_hash()
+                if not game.make_move(move):
+                    raise ValueError("The player picked an illegal move: " + str(move))
+                line.append((position_hash, move, mover))
+                played += 1
+            if winner is None:
+                winner = game.get_winner()
+            self._add_line(line, winner)
+        return played
+
+    def lookup(self, game):
+        """Takes a GessGame and returns a dictionary from each move the book has for its position, as a tuple of
+        strings (current_center, new_center), to a tuple of (games, wins, draws) for the player to move. The
+        dictionary is empty if the position isn't in the book."""
+        moves = self._positions.get(game.get_position_hash())
+        if not moves:
+            return {}
+        return {move.centers(): tuple(stats) for move, stats in moves.items()}
+
+    def choose_move(self, game, min_games=1, rng=None):
+        """Takes a GessGame and returns the book move for the player to move as a Move, or None if the position isn't
+        in the book or no move has been played in at least 'min_games' games. The move with the best score (a win
+        counting 1 and a draw 1/2 per game) is picked, or with a random.Random as 'rng', a move picked at random in
+        proportion to the games it was played in, for variety. Moves are checked with the game's own rules before
+        being returned, and the game isn't changed."""
+        if game.get_game_state() != "UNFINISHED" or game.get_board_size() != self._size:
+            return None
+        moves = self._positions.get(game.get_position_hash())
+        if not moves:
+            return None
+        candidates = [(move, stats) for move, stats in moves.items() if stats[0] >= min_games]
+        if rng is not None:
+            # Sorting by a random number raised to 1 / games orders the moves as repeated weighted picks would
+            candidates.sort(key=lambda candidate: rng.random() ** (1.0 / candidate[1][0]), reverse=True)
+        else:
+            candidates.sort(key=lambda candidate: ((candidate[1][1] + candidate[1][2] / 2) / candidate[1][0],
+                                                   candidate[1][0], -candidate[0]), reverse=True)
+        for move, stats in candidates:
+            # Guards against two positions sharing a hash
+            if game.push_move(move):
+                game.pop_move()
+                return move
+        return None
+
+    def save(self, path):
+        """Writes the book to the file at 'path', replacing it only once the whole book has been written."""
+        records = sum(len(moves) for moves in self._positions.values())
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as book_file:
+            book_file.write(_HEADER.pack(_MAGIC, self._size, self._max_plies, records))
+            for position_hash, moves in self._positions.items():
+                for move, (games, wins, draws) in moves.items():
+                    book_file.write(_RECORD.pack(position_hash, move, games, wins, draws))
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads a book written by save from the file at 'path' and returns it. Raises ValueError if the file isn't
+        an opening book."""
+        with open(path, 'rb') as book_file:
+            data = book_file.read()
+        if len(data) < _HEADER.size:
+            raise ValueError("Not an opening book: " + path)
+        magic, size, max_plies, records = _HEADER.unpack_from(data)
+        if magic != _MAGIC or len(data) != _HEADER.size + records * _RECORD.size:
+            raise ValueError("Not an opening book: " + path)
+        book = cls(max_plies, size)
+        for position_hash, move, games, wins, draws in _RECORD.iter_unpack(data[_HEADER.size:]):
+            book._positions.setdefault(position_hash, {})[Move.from_int(move)] = [games, wins, draws]
+        return book
+
+
+def main(argv=None):
+    """Command line entry point. Adds the games in the given move logs and any number of random self-play games to a
+    book (created if it doesn't exist), saves it and prints the totals."""
+    parser = argparse.ArgumentParser(description="Build a Gess opening book from archived and self-play games.")
+    parser.add_argument("book", help="opening book file to add to")
+    parser.add_argument("archives", nargs='*', help="move log files, one game per line")
+    parser.add_argument("--self-play", type=int, default=0, help="random self-play games to add")
+    parser.add_argument("--max-plies", type=int, default=16, help="plies from the start covered by a new book")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if os.path.exists(args.book):
+        book = OpeningBook.load(args.book)
+    else:
+        book = OpeningBook(args.max_plies)
+    games = 0
+    for path in args.archives:
+        games += book.add_archive(path)
+    book.add_self_play(args.self_play, seed=args.seed)
+    games += args.self_play
+    book.save(args.book)
+    seconds = time.perf_counter() - start
+    print("%d games added, %d positions in the book, %.2f s" % (games, len(book), seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Counts the positions reachable from a GessGame position to a fixed depth (perft), for benchmarking
+#              and checking the move rules.
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+from BatchReplayer import parse_game
+from GessGame import GessGame, Move, _column_name
+
+
+def _all_centers(size):
+    """Returns every legal center on a board with 'size' rows and columns as a string, for example "b2"."""
+    centers = []
+    for row in range(2, size):
+        for column in range(2, size):
+            centers.append(_column_name(column).lower() + str(row))
+    return centers
+
+
+def brute_force_moves(game):
+    """Takes a GessGame and returns every move make_move accepts for the player to move, found by trying every pair
+    of centers with is_valid_move and then push_move, as Moves. Very slow, but it only relies on the rules in
+    make_move, so it is the reference legal_moves() is checked against."""
+    centers = _all_centers(game.get_board_size())
+    moves = []
+    for current_center in centers:
+        for new_center in centers:
+            if game.is_valid_move(current_center, new_center) and game.push_move(current_center, new_center):
+                game.pop_move()
+                moves.append(Move(current_center, new_center))
+    return moves
+
+
+def perft(game, depth, brute_force=False):
+    """Takes a GessGame and a depth and returns the number of move sequences of exactly that length that can be
+    played from its position (positions where the game is over have no moves). Uses legal_moves() unless
+    brute_force is True. The game is back in its original position when this returns."""
+    if depth == 0:
+        return 1
+    if brute_force:
+        moves = brute_force_moves(game)
+    else:
+        moves = list(game.legal_moves())
+    if depth == 1:
+        return len(moves)
+
+    nodes = 0
+    for move in moves:
+        game.push_move(move)
+        try:
+            nodes += perft(game, depth - 1, brute_force)
+        finally:
+            game.pop_move()
+    return nodes
+
+
+def game_from_moves(moves):
+    """Takes a list of moves, as (current_center, new_center) tuples or Moves, and returns a new GessGame with them
+    played from the starting layout. Raises ValueError if one of them is illegal."""
+    game = GessGame()
+    for move in moves:
+        if not isinstance(move, (str, int)):
+            move = Move(move[0], move[1])
+        if isinstance(move, str) or not game.make_move(move):
+            raise ValueError("Illegal move in the starting position: " + str(move))
+    return game
+
+
+def _divide_task(task):
+    """Takes a tuple of (moves to the position, root move, depth, brute force) and returns (root move, perft count
+    below it). Runs in the worker processes, which each rebuild the position from its moves."""
+    moves, root_move, depth, brute_force = task
+    game = game_from_moves(moves + [root_move])
+    return root_move, perft(game, depth - 1, brute_force)
+
+
+def divide(moves, depth, workers=1, brute_force=False):
+    """Takes the moves leading to a position, a depth of at least 1 and a number of worker processes, and returns a
+    list of (root move, perft count below it) tuples, one per legal move in the position. With more than one worker
+    the root moves are split across a process pool."""
+    game = game_from_moves(moves)
+    if brute_force:
+        root_moves = brute_force_moves(game)
+    else:
+        root_moves = list(game.legal_moves())
+    if workers == 1:
+        results = []
+        for root_move in root_moves:
+            game.push_move(root_move)
+            results.append((root_move, perft(game, depth - 1, brute_force)))
+            game.pop_move()
+        return results
+
+    tasks = [(list(moves), root_move, depth, brute_force) for root_move in root_moves]
+    with multiprocessing.Pool(workers) as pool:
+        return pool.map(_divide_task, tasks, chunksize=1)
+
+
+def main(argv=None):
+    """Command line entry point. Prints the perft count for the requested depth, the time it took and the positions
+    per second, optionally broken down by root move and checked against an expected count."""
+    parser = argparse.ArgumentParser(description="Count Gess move sequences to a fixed depth.")
+    parser.add_argument("depth", type=int, help="number of moves to look ahead (at least 1)")
+    parser.add_argument("--moves", default="", help='moves leading to the start position, e.g. "c3-c4 b13-c14"')
+    parser.add_argument("--workers", type=int, default=1,
+                        help="worker processes to split the root moves across (0 for the number of CPUs)")
+    parser.add_argument("--divide", action="store_true", help="print the count below each root move")
+    parser.add_argument("--brute-force", action="store_true",
+                        help="find moves by trying every pair of centers instead of with legal_moves()")
+    parser.add_argument("--expect", type=int, default=None, help="exit with an error if the count differs")
+    args = parser.parse_args(argv)
+    if args.depth < 1:
+        parser.error("depth must be at least 1")
+    workers = args.workers or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    results = divide(parse_game(args.moves), args.depth, workers, args.brute_force)
+    seconds = time.perf_counter() - start
+    nodes = sum(count for move, count in results)
+
+    if args.divide:
+        for move, count in results:
+            print("%s: %d" % (move, count))
+    print("depth %d: %d nodes in %.3f s (%.0f nodes/s)" % (args.depth, nodes, seconds,
+                                                          nodes / seconds if seconds > 0 else 0.0))
+    if args.expect is not None and nodes != args.expect:
+        print("expected %d nodes" % args.expect)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
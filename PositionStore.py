@@ -0,0 +1,286 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Append-only, memory-mapped file of packed GessGame positions with a hash index for finding them.
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from BatchReplayer import parse_game
+from GessGame import GessGame, POSITION_SIZE
+
+# The data file starts with a header of its magic bytes, the number of records and the record size. Each record is
+# the position's Zobrist hash followed by the position packed by GessGame.to_bytes, padded to a multiple of 8 bytes.
+_DATA_MAGIC = b'GESSPOS1'
+_DATA_HEADER = struct.Struct('<8sQQ')
+_RECORD_SIZE = (8 + POSITION_SIZE + 7) // 8 * 8
+_INITIAL_RECORDS = 1024
+
+# The index file starts with a header of its magic bytes, the number of slots and the number of records indexed.
+# Each slot is a position hash and its record number plus one, so an empty slot is all zeros. The number of slots is
+# a power of two, at least twice the number of records, and slots are probed in order from the hash's low bits.
+_INDEX_MAGIC = b'GESSIDX1'
+_INDEX_HEADER = struct.Struct('<8sQQ')
+_SLOT = struct.Struct('<QQ')
+_INITIAL_SLOTS = 2048
+
+_HASH = struct.Struct('<Q')
+
+
+class PositionStore:
+    """A file of unique GessGame positions from the standard 20x20 board that only ever grows. Positions are stored
+    packed (see GessGame.to_bytes) in fixed size records in a memory-mapped data file, so reading one back doesn't copy
+    or unpickle anything, and the store can be far larger than memory. A second memory-mapped file at the data file's
+    path plus '.index' is an open addressing hash table from position hash to record number, used to find positions and
+    to skip adding one that is already stored. The index is rebuilt from the data file if it is missing or doesn't match
+    it, for example after a crash part way through adding a position."""
+
+    def __init__(self, path, readonly=False):
+        """Opens the store at 'path', creating it if it doesn't exist unless 'readonly' is True. A read only store
+        sees the positions that were stored when it was opened, and any number can be open at once."""
+        self._path = path
+        self._index_path = path + '.index'
+        self._readonly = readonly
+        if readonly:
+            self._data_file = open(path, 'rb')
+        elif os.path.exists(path):
+            self._data_file = open(path, 'r+b')
+        else:
+            self._data_file = open(path, 'w+b')
+            self._data_file.write(_DATA_HEADER.pack(_DATA_MAGIC, 0, _RECORD_SIZE))
+            self._data_file.truncate(_DATA_HEADER.size + _INITIAL_RECORDS * _RECORD_SIZE)
+        self._data = self._map(self._data_file)
+        magic, self._count, record_size = _DATA_HEADER.unpack_from(self._data)
+        if magic != _DATA_MAGIC or record_size != _RECORD_SIZE:
+            self.close()
+            raise ValueError("Not a position store: " + path)
+
+        self._index_file = None
+        self._index = None
+        self._slots = 0
+        if os.path.exists(self._index_path):
+            self._index_file = open(self._index_path, 'rb' if readonly else 'r+b')
+            self._index = self._map(self._index_file)
+            magic, self._slots, indexed = _INDEX_HEADER.unpack_from(self._index)
+            if magic != _INDEX_MAGIC or indexed != self._count:
+                self._build_index(self._slots)
+        else:
+            self._build_index(_INITIAL_SLOTS)
+
+    def __len__(self):
+        """Returns the number of positions stored."""
+        return self._count
+
+    def __contains__(self, game):
+        """Returns True if the GessGame's position is stored."""
+        return self.find(game) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _map(self, file):
+        """Returns a memory map of the whole of an open file, read only if the store is."""
+        if self._readonly:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return mmap.mmap(file.fileno(), 0)
+
+    def _build_index(self, slots):
+        """Replaces the index with an empty one with the given number of slots (made larger if needed to keep it at
+        most half full) and adds every stored record to it. A read only store builds its index in memory instead of
+        writing it to disk."""
+        slots = max(slots, _INITIAL_SLOTS)
+        while slots < 2 * (self._count + 1):
+            slots *= 2
+        size = _INDEX_HEADER.size + slots * _SLOT.size
+        if self._index is not None:
+            self._index.close()
+        if self._readonly:
+            if self._index_file is not None:
+                self._index_file.close()
+                self._index_file = None
+            self._index = mmap.mmap(-1, size)
+        else:
+            if self._index_file is None:
+                self._index_file = open(self._index_path, 'w+b')
+            # Truncating to nothing first means every slot in the larger file reads back as zeros, i.e. empty
+            self._index_file.truncate(0)
+            self._index_file.truncate(size)
+            self._index = self._map(self._index_file)
+        self._slots = slots
+
+        data = self._data
+        for number in range(self._count):
+            key = _HASH.unpack_from(data, _DATA_HEADER.size + number * _RECORD_SIZE)[0]
+            self._set_slot(self._lookup(key, None)[1], key, number)
+        _INDEX_HEADER.pack_into(self._index, 0, _INDEX_MAGIC, slots, self._count)
+
+    def _lookup(self, key, position):
+        """Takes a position hash and a packed position, and returns a tuple of (the position's record number or None,
+        the slot it is in or the empty slot where it would go). If 'position' is None, only the empty slot is
+        looked for. A slot pointing past the last counted record is treated as empty: it was written by an add that
+        crashed before counting its record, and the next add reuses both."""
+        index = self._index
+        data = self._data
+        mask = self._slots - 1
+        slot = key & mask
+        while True:
+            stored_key, number = _SLOT.unpack_from(index, _INDEX_HEADER.size + slot * _SLOT.size)
+            if number == 0 or number > self._count:
+                return None, slot
+            if position is not None and stored_key == key:
+                offset = _DATA_HEADER.size + (number - 1) * _RECORD_SIZE + 8
+                if data[offset:offset + POSITION_SIZE] == position:
+                    return number - 1, slot
+            slot = (slot + 1) & mask
+
+    def _set_slot(self, slot, key, number):
+        """Points an index slot at a record."""
+        _SLOT.pack_into(self._index, _INDEX_HEADER.size + slot * _SLOT.size, key, number + 1)
+
+    def find(self, game):
+        """Takes a GessGame and returns the record number its position is stored at, or None if it isn't stored."""
+        return self._lookup(game.get_position_hash(), game.to_bytes())[0]
+
+    def add(self, game):
+        """Takes a GessGame and stores its position if it isn't stored already. Returns the position's record
+        number. Raises ValueError if the game isn't on the standard 20x20 board, which is the only size records have
+        room for, or the store is read only."""
+        position = game.to_bytes()
+        if len(position) != POSITION_SIZE:
+            raise ValueError("A position store only holds positions from the standard 20x20 board, not %dx%d." %
+                             (game.get_board_size(), game.get_board_size()))
+        return self._add(game.get_position_hash(), position)
+
+    def add_bytes(self, position):
+        """Takes a position packed by GessGame.to_bytes and stores it if it isn't stored already. Returns the
+        position's record number. Raises ValueError if it isn't a valid packed position or the store is read only."""
+        position = bytes(position)
+        return self._add(GessGame.from_bytes(position).get_position_hash(), position)
+
+    def _add(self, key, position):
+        """Stores a packed position with the given hash unless it is already stored, and returns its record number."""
+        if self._readonly:
+            raise ValueError("Can't add positions to a read only position store.")
+        number, slot = self._lookup(key, position)
+        if number is not None:
+            return number
+
+        number = self._count
+        offset = _DATA_HEADER.size + number * _RECORD_SIZE
+        if offset + _RECORD_SIZE > len(self._data):
+            self._grow()
+        _HASH.pack_into(self._data, offset, key)
+        self._data[offset + 8:offset + 8 + POSITION_SIZE] = position
+        self._set_slot(slot, key, number)
+        # The counts are written last, so after a crash before this the record and its slot point past the count and
+        # are treated as unused (see _lookup)
+        self._count += 1
+        _DATA_HEADER.pack_into(self._data, 0, _DATA_MAGIC, self._count, _RECORD_SIZE)
+        _INDEX_HEADER.pack_into(self._index, 0, _INDEX_MAGIC, self._slots, self._count)
+        if 2 * self._count > self._slots:
+            self._build_index(self._slots * 2)
+        return number
+
+    def _grow(self):
+        """Doubles the space for records in the data file. The old memory map isn't closed, so views handed out by
+        get_bytes stay valid; it is unmapped once the last of them is released."""
+        records = (len(self._data) - _DATA_HEADER.size) // _RECORD_SIZE
+        self._data.flush()
+        self._data_file.truncate(_DATA_HEADER.size + 2 * max(records, _INITIAL_RECORDS // 2) * _RECORD_SIZE)
+        self._data = self._map(self._data_file)
+
+    def _check_number(self, number):
+        """Raises IndexError if there is no record with the given number."""
+        if not 0 <= number < self._count:
+            raise IndexError("No position stored at record %d" % number)
+
+    def get_bytes(self, number):
+        """Returns the packed position stored at the given record number as a read only memoryview of the data file,
+        without copying it. Raises IndexError if there is no such record."""
+        self._check_number(number)
+        offset = _DATA_HEADER.size + number * _RECORD_SIZE + 8
+        return memoryview(self._data)[offset:offset + POSITION_SIZE].toreadonly()
+
+    def get_hash(self, number):
+        """Returns the position hash stored with the given record number. Raises IndexError if there is no such
+        record."""
+        self._check_number(number)
+        return _HASH.unpack_from(self._data, _DATA_HEADER.size + number * _RECORD_SIZE)[0]
+
+    def get(self, number):
+        """Returns a new GessGame in the position stored at the given record number (see GessGame.from_bytes).
+        Raises IndexError if there is no such record."""
+        return GessGame.from_bytes(self.get_bytes(number))
+
+    def flush(self):
+        """Writes every change so far out to disk."""
+        if not self._readonly:
+            self._data.flush()
+            self._index.flush()
+
+    def close(self):
+        """Flushes and closes the store. Memory maps that views from get_bytes still refer to are left for those
+        views to release."""
+        for mapping in (self._data, self._index):
+            if mapping is None:
+                continue
+            if not self._readonly:
+                mapping.flush()
+            try:
+                mapping.close()
+            except BufferError:
+                pass
+        self._data = None
+        self._index = None
+        for file in (self._data_file, self._index_file):
+            if file is not None:
+                file.close()
+        self._data_file = None
+        self._index_file = None
+
+
+def main(argv=None):
+    """Command line entry point. Adds every position reached in the games in the given move logs (one game per line,
+    see BatchReplayer.parse_game) to a store, stopping each game at its first illegal move, then prints the totals."""
+    parser = argparse.ArgumentParser(description="Store the positions reached in archived Gess games.")
+    parser.add_argument("store", help="position store to add to (created if it doesn't exist)")
+    parser.add_argument("archives", nargs='*', help="move log files, one game per line")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    seen = 0
+    with PositionStore(args.store) as store:
+        before = len(store)
+        for path in args.archives:
+            with open(path) as log_file:
+                for line in log_file:
+                    line = line.strip()
+                    if not line or line.startswith('#'):
+                        continue
+                    game = GessGame()
+                    store.add(game)
+                    seen += 1
+                    for move in parse_game(line):
+                        try:
+                            legal = not isinstance(move, str) and game.make_move(move[0], move[1])
+                        except (ValueError, IndexError):
+                            legal = False
+                        if not legal:
+                            break
+                        store.add(game)
+                        seen += 1
+        added = len(store) - before
+        total = len(store)
+    seconds = time.perf_counter() - start
+    print("%d positions seen, %d added, %d stored in %.2f s" % (seen, added, total, seconds))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# Author: Kento Woolery
+# Date: 10/18/2026
+# Description: Bounded table of search results for GessGame positions, keyed by position hash.
+
+from collections import OrderedDict
+
+# What an entry's value means: the exact score, or a bound on it from a search that was cut off.
+EXACT = "EXACT"
+LOWER_BOUND = "LOWER_BOUND"
+UPPER_BOUND = "UPPER_BOUND"
+
+# Replacement policies for when the table is full.
+DEPTH_PREFERRED = "DEPTH_PREFERRED"
+LRU = "LRU"
+
+
+class TranspositionTable:
+    """Stores the results of analyzing GessGame positions so a position reached again through a different order of
+    moves doesn't have to be analyzed again. Entries are keyed by GessGame.get_position_hash() and are tuples of
+    (key, depth, value, flag, best_move), where flag is EXACT, LOWER_BOUND or UPPER_BOUND.
+
+    The table never holds more than 'capacity' entries. With the DEPTH_PREFERRED policy every key has one slot
+    (key % capacity) and a new entry only replaces an entry for a different position if it was searched at least as
+    deeply. With the LRU policy the least recently stored or probed entry is dropped to make room."""
+
+    def __init__(self, capacity=1 << 20, policy=DEPTH_PREFERRED):
+        """Initializes an empty table holding at most 'capacity' entries, replaced according to 'policy'."""
+        if capacity < 1:
+            raise ValueError("A transposition table needs room for at least one entry.")
+        if policy != DEPTH_PREFERRED and policy != LRU:
+            raise ValueError("Unknown replacement policy: " + str(policy))
+        self._capacity = capacity
+        self._policy = policy
+        self._size = 0
+        if policy == DEPTH_PREFERRED:
+            self._slots = [None] * capacity
+        else:
+            self._entries = OrderedDict()
+
+    def __len__(self):
+        """Returns the number of entries currently stored."""
+        return self._size
+
+    def get_capacity(self):
+        """Returns the largest number of entries the table will hold."""
+        return self._capacity
+
+    def get_policy(self):
+        """Returns the replacement policy, either DEPTH_PREFERRED or LRU."""
+        return self._policy
+
+    def probe(self, key):
+        """Takes a position hash and returns its (key, depth, value, flag, best_move) entry, or None if the position
+        isn't stored."""
+        if self._policy == DEPTH_PREFERRED:
+            entry = self._slots[key % self._capacity]
+            if entry is not None and entry[0] == key:
+                return entry
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def store(self, key, depth, value, flag=EXACT, best_move=None):
+        """Takes a position hash, the depth it was searched to, the resulting value, what kind of value it is and
+        the best move found, and stores them. Returns True if the entry was stored, or False if the depth-preferred
+        policy kept a deeper entry for another position instead."""
+        entry = (key, depth, value, flag, best_move)
+        if self._policy == DEPTH_PREFERRED:
+            index = key % self._capacity
+            current = self._slots[index]
+            if current is None:
+                self._size += 1
+            elif current[0] != key and current[1] > depth:
+                return False
+            self._slots[index] = entry
+            return True
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        elif self._size == self._capacity:
+            self._entries.popitem(last=False)
+        else:
+            self._size += 1
+        self._entries[key] = entry
+        return True
+
+    def clear(self):
+        """Removes every entry from the table."""
+        self._size = 0
+        if self._policy == DEPTH_PREFERRED:
+            self._slots = [None] * self._capacity
+        else:
+            self._entries.clear()
@@ -0,0 +1,67 @@
+import unittest
+
+import numpy as np
+
+from BatchedGessEnv import BatchedGessEnv, BLACK, GAME_STATES, NUM_ACTIONS, WHITE
+from GessGame import GessGame
+
+
+def _board_array(game):
+    """Returns a 20x20 array of EMPTY, BLACK and WHITE for a GessGame's position, read from GessGame.to_bytes."""
+    packed = np.frombuffer(game.to_bytes(), dtype=np.uint8)
+    bitboard_bytes = (len(packed) - 1) // 2
+    black = np.unpackbits(packed[:bitboard_bytes], bitorder='little')[:400].reshape(20, 20)
+    white = np.unpackbits(packed[bitboard_bytes:2 * bitboard_bytes], bitorder='little')[:400].reshape(20, 20)
+    return (black * BLACK + white * WHITE).astype(np.int8)
+
+
+class BatchedGessEnvTest(unittest.TestCase):
+    """A batch of games played with the same actions as one GessGame per game, which the batch should match exactly."""
+
+    def _check_games(self, env, games):
+        for index, game in enumerate(games):
+            self.assertEqual(GAME_STATES[env.get_game_states()[index]], game.get_game_state(), index)
+            self.assertEqual(env.get_current_players()[index], BLACK if game.get_current_player() == 'X' else WHITE)
+            np.testing.assert_array_equal(env.get_boards()[index], _board_array(game))
+
+    def test_matches_make_move(self):
+        rng = np.random.default_rng(2020)
+        num_games = 16
+        env = BatchedGessEnv(num_games)
+        games = [GessGame() for _ in range(num_games)]
+        for _ in range(40):
+            mask = env.legal_mask()
+            for index, game in enumerate(games):
+                legal = set(BatchedGessEnv.encode_move(*move) for move in game.legal_moves())
+                self.assertEqual(set(np.flatnonzero(mask[index])), legal, index)
+
+            # Half the games get a legal action, the rest a random one that is usually rejected, and a few none
+            legal_actions = np.argmax(rng.random(mask.shape) * mask, axis=1)
+            actions = np.where(rng.random(num_games) < 0.5, legal_actions, rng.integers(0, NUM_ACTIONS, num_games))
+            actions[rng.random(num_games) < 0.1] = -1
+            made = env.step(actions)
+            for index, game in enumerate(games):
+                move = BatchedGessEnv.decode_action(int(actions[index])) if actions[index] >= 0 else None
+                expected = move is not None and game.make_move(move[0], move[1])
+                self.assertEqual(bool(made[index]), expected, (index, move))
+            self._check_games(env, games)
+
+    def test_encode_and_decode(self):
+        action = BatchedGessEnv.encode_move("c3", "c6")
+        self.assertEqual(BatchedGessEnv.decode_action(action), ("c3", "c6"))
+        self.assertIsNone(BatchedGessEnv.encode_move("c3", "d5"))
+        self.assertIsNone(BatchedGessEnv.decode_action(BatchedGessEnv.encode_move("b2", "b1")))
+
+    def test_reset(self):
+        env = BatchedGessEnv(2)
+        action = BatchedGessEnv.encode_move("c3", "c4")
+        self.assertTrue(env.step(np.array([action, action])).all())
+        env.reset([0])
+        moved = GessGame()
+        moved.make_move("c3", "c4")
+        self._check_games(env, [GessGame(), moved])
+        self.assertEqual(list(env.get_turn_numbers()), [1, 2])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from FBoard import FBoard
+
+
+def _board(x_position, o_positions):
+    """Returns an FBoard with the 'x' piece and the 'o' pieces on the given (row, column) squares."""
+    board = FBoard()
+    board._x_row, board._x_column = x_position
+    board._o_board = 0
+    for row, column in o_positions:
+        board._o_board |= 1 << row * 8 + column
+    return board
+
+
+class FBoardTest(unittest.TestCase):
+    """Moves and traps, including on the edge of the board."""
+
+    def test_starting_position(self):
+        board = FBoard()
+        self.assertEqual((board.get_x_row(), board.get_x_column()), (0, 0))
+        self.assertEqual(board.get_o_positions(), [(5, 7), (6, 6), (7, 5), (7, 7)])
+        self.assertEqual(board.get_game_state(), "UNFINISHED")
+
+    def test_moves(self):
+        board = FBoard()
+        self.assertFalse(board.move_x(0, 1))
+        self.assertTrue(board.move_x(1, 1))
+        # 'o' moves diagonally, but never down and to the right
+        self.assertFalse(board.move_o(6, 6, 7, 7))
+        self.assertFalse(board.move_o(5, 7, 6, 8))
+        self.assertTrue(board.move_o(6, 6, 5, 5))
+        self.assertTrue(board.move_o(5, 5, 6, 4))
+        self.assertFalse(board.move_o(1, 1, 0, 0))
+        self.assertEqual(board.get_o_positions(), [(5, 7), (6, 4), (7, 5), (7, 7)])
+
+    def test_off_board_moves_are_rejected(self):
+        board = _board((0, 3), [(5, 7), (6, 0), (7, 5), (7, 7)])
+        for row, column in ((-1, 2), (-1, 4), (0, 3), (8, 8)):
+            self.assertFalse(board.available_move_x(row, column))
+            self.assertFalse(board.move_x(row, column))
+        for move in ((5, 7, 4, 8), (6, 0, 7, -1), (7, 7, 8, 6), (8, 8, 7, 7), (-1, 0, 0, 1)):
+            self.assertFalse(board.available_move_o(*move))
+            self.assertFalse(board.move_o(*move))
+        self.assertEqual((board.get_x_row(), board.get_x_column()), (0, 3))
+        self.assertEqual(board.get_o_positions(), [(5, 7), (6, 0), (7, 5), (7, 7)])
+        self.assertEqual(board.get_game_state(), "UNFINISHED")
+
+    def test_trap_in_the_middle(self):
+        board = _board((3, 3), [(2, 2), (2, 4), (4, 2), (5, 5)])
+        self.assertTrue(board.move_o(5, 5, 4, 4))
+        self.assertEqual(board.get_game_state(), "O_WON")
+        self.assertFalse(board.move_x(2, 2))
+
+    def test_three_of_four_is_not_a_trap(self):
+        board = _board((3, 3), [(2, 2), (2, 4), (5, 1), (6, 6)])
+        self.assertTrue(board.move_o(5, 1, 4, 2))
+        self.assertEqual(board.get_game_state(), "UNFINISHED")
+
+    def test_trap_on_the_edge(self):
+        board = _board((0, 4), [(1, 3), (2, 6), (7, 5), (7, 7)])
+        self.assertTrue(board.move_o(2, 6, 1, 5))
+        self.assertEqual(board.get_game_state(), "O_WON")
+
+        board = _board((4, 7), [(3, 6), (6, 7), (7, 5), (7, 7)])
+        self.assertTrue(board.move_o(6, 7, 5, 6))
+        self.assertEqual(board.get_game_state(), "O_WON")
+
+    def test_trap_in_the_corner(self):
+        board = _board((0, 0), [(2, 2), (5, 7), (7, 5), (7, 7)])
+        self.assertTrue(board.move_o(2, 2, 1, 1))
+        self.assertEqual(board.get_game_state(), "O_WON")
+
+    def test_x_wins_in_the_far_corner(self):
+        board = _board((6, 6), [(0, 1), (0, 3), (0, 5), (0, 7)])
+        self.assertTrue(board.move_x(7, 7))
+        self.assertEqual(board.get_game_state(), "X_WON")
+        self.assertFalse(board.move_o(0, 1, 1, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+import FBoardSimulator
+from FBoard import FBoard
+
+
+class FBoardSimulatorTest(unittest.TestCase):
+    """Games played one at a time by the simulator, replayed move by move on an FBoard."""
+
+    def _play(self, seed, max_plies=200):
+        """Plays one game with random policies that record every position and move they are given, and returns the
+        simulator's report and a list of (x position, 'o' positions, legal moves, move picked) for each ply."""
+        log = []
+
+        def policy(x_rows, x_columns, o_rows, o_columns, legal, rng):
+            moves = FBoardSimulator.random_policy(x_rows, x_columns, o_rows, o_columns, legal, rng)
+            log.append(((int(x_rows[0]), int(x_columns[0])), list(zip(o_rows[0].tolist(), o_columns[0].tolist())),
+                        legal[0].tolist(), int(moves[0])))
+            return moves
+
+        report = FBoardSimulator.simulate(1, policy, policy, max_plies=max_plies, seed=seed)
+        return report, log
+
+    def test_matches_fboard(self):
+        results = set()
+        for seed in range(150):
+            report, log = self._play(seed)
+            board = FBoard()
+            stuck = None
+            for ply, (x_position, o_positions, legal, move) in enumerate(log):
+                self.assertEqual((board.get_x_row(), board.get_x_column()), x_position)
+                self.assertEqual(board.get_o_positions(), sorted(o_positions))
+                x_row, x_column = x_position
+                if ply % 2 == 0:
+                    moves = [(x_row + row_step, x_column + column_step)
+                             for row_step, column_step in FBoardSimulator.X_STEPS.tolist()]
+                    self.assertEqual(legal, [board.available_move_x(*move) for move in moves])
+                else:
+                    moves = [(row, column, row + row_step, column + column_step) for row, column in o_positions
+                             for row_step, column_step in FBoardSimulator.O_STEPS.tolist()]
+                    self.assertEqual(legal, [board.available_move_o(*move) for move in moves])
+                if not any(legal):
+                    # A player with no legal move loses, which FBoard leaves to its caller
+                    stuck = "O_WON" if ply % 2 == 0 else "X_WON"
+                    break
+                if ply % 2 == 0:
+                    self.assertTrue(board.move_x(*moves[move]))
+                else:
+                    self.assertTrue(board.move_o(*moves[move]))
+
+            state = stuck or board.get_game_state()
+            results.add(state)
+            self.assertEqual(report["x_wins"], int(state == "X_WON"), seed)
+            self.assertEqual(report["o_wins"], int(state == "O_WON"), seed)
+            self.assertEqual(report["unfinished"], int(state == "UNFINISHED"), seed)
+        self.assertLessEqual({"X_WON", "O_WON"}, results)
+
+    def test_counts_add_up(self):
+        report = FBoardSimulator.simulate(2000, max_plies=20, batch_size=300, seed=1)
+        self.assertEqual(report["x_wins"] + report["o_wins"] + report["unfinished"], 2000)
+        self.assertGreater(report["unfinished"], 0)
+        self.assertEqual(FBoardSimulator.simulate(2000, max_plies=20, batch_size=300, seed=1)["o_wins"],
+                         report["o_wins"])
+
+    def test_illegal_policy_is_rejected(self):
+        def bad_policy(x_rows, x_columns, o_rows, o_columns, legal, rng):
+            return np.argmin(legal, axis=1)
+
+        self.assertRaises(ValueError, FBoardSimulator.simulate, 10, bad_policy, seed=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import os
+import random
+import tempfile
+import unittest
+
+import FBoardTablebase
+from FBoard import FBoard
+
+
+def _board(x_position, o_positions):
+    """Returns an FBoard with the 'x' piece and the 'o' pieces on the given (row, column) squares."""
+    board = FBoard()
+    board._x_row, board._x_column = x_position
+    board._o_board = 0
+    for row, column in o_positions:
+        board._o_board |= 1 << row * 8 + column
+    return board
+
+
+class FBoardTablebaseTest(unittest.TestCase):
+    """The solved tablebase, checked against FBoard's own rules."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tablebase = FBoardTablebase.FBoardTablebase.solve()
+
+    def _expected(self, x_position, o_positions, x_to_move):
+        """Returns the (result, plies) the tablebase should give a position, worked out one ply ahead with FBoard's
+        moves and the tablebase's results for the positions after them."""
+        x_row, x_column = x_position
+        if x_position == (7, 7):
+            return "X_WON", 0
+        x_moves = [(x_row + row_step, x_column + column_step) for row_step in (-1, 1) for column_step in (-1, 1)]
+        board = _board(x_position, o_positions)
+        if not any(board.available_move_x(*move) for move in x_moves):
+            # Every square diagonal to 'x' that is on the board holds an 'o'
+            return "O_WON", 0
+
+        results = []
+        if x_to_move:
+            for move in x_moves:
+                if board.available_move_x(*move):
+                    after = _board(x_position, o_positions)
+                    self.assertTrue(after.move_x(*move))
+                    results.append(self.tablebase.evaluate(after, False))
+        else:
+            for row, column in o_positions:
+                for row_step, column_step in ((1, -1), (-1, 1), (-1, -1)):
+                    move = (row, column, row + row_step, column + column_step)
+                    if board.available_move_o(*move):
+                        after = _board(x_position, o_positions)
+                        self.assertTrue(after.move_o(*move))
+                        results.append(self.tablebase.evaluate(after, True))
+
+        mover = "X_WON" if x_to_move else "O_WON"
+        other = "O_WON" if x_to_move else "X_WON"
+        if not results:
+            # A player with no legal move loses
+            return other, 0
+        wins = [plies for result, plies in results if result == mover]
+        if wins:
+            return mover, min(wins) + 1
+        if any(result == "DRAW" for result, _ in results):
+            return "DRAW", 0
+        return other, max(plies for _, plies in results) + 1
+
+    def test_start_position(self):
+        self.assertEqual(self.tablebase.evaluate(FBoard(), True), ("O_WON", 36))
+
+    def test_consistent_with_fboard_rules(self):
+        squares = FBoardTablebase._SQUARES
+        rng = random.Random(2020)
+        seen = set()
+        for _ in range(20000):
+            pieces = rng.sample(squares, 5)
+            x_to_move = rng.random() < 0.5
+            result = self.tablebase.evaluate(_board(pieces[0], pieces[1:]), x_to_move)
+            seen.add(result[0])
+            self.assertEqual(result, self._expected(pieces[0], pieces[1:], x_to_move), (pieces, x_to_move))
+        self.assertEqual(seen, {"X_WON", "O_WON", "DRAW"})
+
+    def test_best_move_keeps_the_result(self):
+        board = FBoard()
+        x_to_move = True
+        result, plies = self.tablebase.evaluate(board, x_to_move)
+        while plies:
+            move = self.tablebase.best_move(board, x_to_move)
+            if move[0] == "x":
+                self.assertTrue(board.move_x(*move[1:]))
+            else:
+                self.assertTrue(board.move_o(*move[1:]))
+            x_to_move = not x_to_move
+            self.assertEqual(self.tablebase.evaluate(board, x_to_move), (result, plies - 1))
+            plies -= 1
+        self.assertEqual(board.get_game_state(), result)
+        self.assertIsNone(self.tablebase.best_move(board, x_to_move))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tablebase')
+            self.tablebase.save(path)
+            loaded = FBoardTablebase.FBoardTablebase.load(path)
+            self.assertEqual(loaded._values, self.tablebase._values)
+            self.assertEqual(loaded.evaluate(FBoard(), False), self.tablebase.evaluate(FBoard(), False))
+            with open(path, 'r+b') as table_file:
+                table_file.write(b'NOTATABL')
+            self.assertRaises(ValueError, FBoardTablebase.FBoardTablebase.load, path)
+
+    def test_positions_off_the_tablebase_squares(self):
+        self.assertRaises(ValueError, self.tablebase.evaluate, _board((0, 1), [(5, 7), (6, 6), (7, 5), (7, 7)]))
+
+
+if __name__ == '__main__':
+    unittest.main()
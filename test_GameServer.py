@@ -0,0 +1,78 @@
+import asyncio
+import json
+import unittest
+
+from GameServer import GameServer, run_load
+
+
+class GameServerTest(unittest.TestCase):
+    """Requests sent over a real connection to a server started in this process."""
+
+    def _exchange(self, lines):
+        """Starts a server, sends each line in turn and returns the decoded response to each."""
+
+        async def run():
+            server = GameServer(workers=1)
+            await server.start()
+            reader, writer = await asyncio.open_connection('127.0.0.1', server.get_port())
+            responses = []
+            try:
+                for line in lines:
+                    writer.write(line.encode() + b'\n')
+                    await writer.drain()
+                    responses.append(json.loads(await asyncio.wait_for(reader.readline(), 5)))
+            finally:
+                writer.close()
+                await server.stop()
+            return responses
+
+        return asyncio.run(run())
+
+    def test_bad_first_line_gets_an_error(self):
+        responses = self._exchange(['not json', json.dumps({"op": "create", "id": 1})])
+        self.assertFalse(responses[0]["ok"])
+        self.assertNotIn("id", responses[0])
+        self.assertTrue(responses[1]["ok"])
+        self.assertEqual(responses[1]["id"], 1)
+
+    def test_bad_later_line_does_not_reuse_the_previous_id(self):
+        responses = self._exchange([json.dumps({"op": "create", "id": 7}), 'not json'])
+        self.assertTrue(responses[0]["ok"])
+        self.assertFalse(responses[1]["ok"])
+        self.assertNotIn("id", responses[1])
+
+    def test_move_and_legal_moves(self):
+        responses = self._exchange([
+            json.dumps({"op": "create"}),
+            json.dumps({"op": "legal_moves", "session": 1}),
+            json.dumps({"op": "move", "session": 1, "move": ["c3", "c4"]}),
+            json.dumps({"op": "move", "session": 1, "move": ["c3"]})
+        ])
+        self.assertEqual(len(responses[1]["moves"]), 319)
+        self.assertIn(["c3", "c4"], responses[1]["moves"])
+        self.assertTrue(responses[2]["result"])
+        self.assertEqual(responses[2]["player"], 'O')
+        self.assertFalse(responses[3]["ok"])
+
+    def test_stats(self):
+        responses = self._exchange([
+            json.dumps({"op": "stats"}),
+            json.dumps({"op": "create", "bot": True}),
+            json.dumps({"op": "move", "session": 1, "move": ["c3", "c4"]}),
+            json.dumps({"op": "stats"})
+        ])
+        self.assertEqual(responses[0]["sessions"], 0)
+        self.assertTrue(responses[2]["result"])
+        self.assertEqual(responses[3]["sessions"], 1)
+        self.assertGreater(responses[3]["cpu_seconds"], responses[0]["cpu_seconds"])
+
+    def test_load_report(self):
+        report = asyncio.run(run_load(sessions=4, moves=3, workers=1))
+        self.assertEqual(report["sessions"], 4)
+        self.assertEqual(report["moves"], 12)
+        self.assertGreater(report["cpu_ms_per_move"], 0)
+        self.assertGreater(report["sessions_per_core"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,279 @@
+import contextlib
+import io
+import os
+import pickle
+import random
+import unittest
+import zlib
+from unittest import mock
+
+import GessGame as gess_module
+from GessGame import GessGame, Move
+from Perft import brute_force_moves, perft
+
+# Moves recorded from the original list of lists GessGame (the baseline commit), one per line: the two centers,
+# whether is_valid_move and make_move accepted the move (1 or 0), the game state afterwards and a CRC-32 of what
+# print_board printed afterwards. Lines starting with '#' start a new game. See record_replay.
+_REPLAY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_GessGame_replay.txt')
+
+_WINNERS = {'BLACK_WINS': 'X', 'WHITE_WINS': 'O'}
+_COLUMNS = 'ABCDEFGHIJKLMNOPQRST'
+_DISTANCES = (1, 1, 1, 2, 2, 3, 3, 4, 5, 7, 10, 17)
+# Rows count down the board from 1 at the top, so north is towards row 1
+_STEPS = {'N': (-1, 0), 'NE': (-1, 1), 'E': (0, 1), 'SE': (1, 1), 'S': (1, 0), 'SW': (1, -1), 'W': (0, -1),
+          'NW': (-1, -1)}
+
+
+def _board_digest(game):
+    """Returns the CRC-32 of what the game's print_board prints, which both the original class and the bitboard one
+    print the same way."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        game.print_board()
+    return zlib.crc32(output.getvalue().encode())
+
+
+def _sample_move(game, player, rng):
+    """Returns a random (current_center, new_center) for the player to move, using only methods the original class
+    has. Mostly a piece holding only the player's stones moved a random distance towards one of them, and sometimes
+    any two spaces on the board."""
+    if rng.random() < 0.1:
+        return (rng.choice(_COLUMNS).lower() + str(rng.randint(1, 20)),
+                rng.choice(_COLUMNS) + str(rng.randint(1, 20)))
+    for _ in range(50):
+        row = rng.randint(2, 19)
+        column = rng.randint(2, 19)
+        footprint = game.create_footprint(_COLUMNS[column - 1].lower() + str(row))
+        stones = set(footprint.values())
+        if player in stones and len(stones - {player, '_'}) == 0:
+            break
+    directions = [direction for direction, stone in footprint.items() if direction != 'C' and stone == player]
+    if not directions or rng.random() < 0.2:
+        directions = list(_STEPS)
+    row_step, column_step = _STEPS[rng.choice(directions)]
+    distance = rng.choice(_DISTANCES)
+    new_row = min(20, max(1, row + row_step * distance))
+    new_column = min(20, max(1, column + column_step * distance))
+    return _COLUMNS[column - 1].lower() + str(row), _COLUMNS[new_column - 1].lower() + str(new_row)
+
+
+def record_replay(game_class, games=40, moves=150, seed=5232020):
+    """Plays 'games' seeded random games of up to 'moves' tries each with 'game_class' and returns the lines of a
+    replay file (see _REPLAY_PATH). The file the tests check against was recorded by passing this the GessGame class
+    from the baseline commit's GessGame.py (git show 565777b:GessGame.py), loaded under another module name with
+    importlib since it needs nothing else from the repo. Changing the sampling or the defaults changes the games, so
+    the file has to be recorded again."""
+    rng = random.Random(seed)
+    lines = []
+    for game_number in range(games):
+        game = game_class()
+        made = 0
+        lines.append('# game %d' % game_number)
+        for _ in range(moves):
+            player = 'O' if made % 2 else 'X'
+            current_center, new_center = _sample_move(game, player, rng)
+            valid = game.is_valid_move(current_center, new_center)
+            accepted = game.make_move(current_center, new_center)
+            made += bool(accepted)
+            lines.append('%s %s %d %d %s %d' % (current_center, new_center, valid, accepted, game.get_game_state(),
+                                                _board_digest(game)))
+            if game.get_game_state() != 'UNFINISHED':
+                break
+    return lines
+
+
+class ReplayTest(unittest.TestCase):
+    """The rules give the same answers as the original class on a fixed set of random games."""
+
+    def test_replay_matches_original(self):
+        with open(_REPLAY_PATH) as replay_file:
+            lines = replay_file.read().splitlines()
+        game = None
+        for number, line in enumerate(lines, 1):
+            if line.startswith('#'):
+                game = GessGame()
+                continue
+            current_center, new_center, valid, accepted, state, digest = line.split()
+            where = 'line %d: %s %s' % (number, current_center, new_center)
+            self.assertEqual(game.is_valid_move(current_center, new_center), valid == '1', where)
+            self.assertEqual(game.make_move(current_center, new_center), accepted == '1', where)
+            self.assertEqual(game.get_game_state(), state, where)
+            self.assertEqual(game.get_winner(), _WINNERS.get(state), where)
+            self.assertEqual(_board_digest(game), int(digest), where)
+
+    def test_winner(self):
+        game = GessGame()
+        self.assertIsNone(game.get_winner())
+        game.make_move("c3", "c4")
+        game.resign_game()
+        self.assertEqual(game.get_winner(), 'X')
+
+    def test_unreadable_centers_are_rejected(self):
+        game = GessGame()
+        for current_center, new_center in (("d14", "d-4"), ("1c", "c4"), ("c3", "cx"), ("c3", ""), ("", "c4")):
+            self.assertFalse(game.is_valid_move(current_center, new_center))
+            self.assertFalse(game.make_move(current_center, new_center))
+            self.assertFalse(game.push_move(current_center, new_center))
+        self.assertTrue(game.make_move("c3", "c4"))
+        self.assertRaises(ValueError, Move, "1c", "c4")
+
+
+class MoveGenerationTest(unittest.TestCase):
+    """legal_moves and random_move agree with make_move."""
+
+    def _positions(self):
+        """Yields games in a few positions reached by seeded random play."""
+        rng = random.Random(7)
+        game = GessGame()
+        for ply in range(40):
+            if ply % 10 == 0:
+                yield game.clone()
+            move = game.random_move(rng)
+            if move is None or not game.make_move(move):
+                break
+
+    def test_perft(self):
+        game = GessGame()
+        self.assertEqual(perft(game, 1), 319)
+        self.assertEqual(perft(game, 2), 132704)
+
+    def test_legal_moves_match_brute_force(self):
+        for game in self._positions():
+            moves = list(game.legal_moves())
+            self.assertEqual(len(moves), len(set(moves)))
+            self.assertEqual(set(moves), set(brute_force_moves(game)))
+
+    def test_random_move_is_legal(self):
+        for game in self._positions():
+            legal = set(game.legal_moves())
+            rng = random.Random(3)
+            for _ in range(20):
+                self.assertIn(game.random_move(rng), legal)
+
+    def test_moves_unpack_into_centers(self):
+        # legal_moves and random_move have always handed out (current_center, new_center) pairs
+        for game in self._positions():
+            pairs = [(current_center, new_center) for current_center, new_center in game.legal_moves()]
+            self.assertEqual(pairs, [move.centers() for move in game.legal_moves()])
+            for current_center, new_center in pairs[:10]:
+                self.assertTrue(game.is_valid_move(current_center, new_center))
+            current_center, new_center = game.random_move(random.Random(5))
+            self.assertIn((current_center, new_center), pairs)
+            self.assertTrue(game.make_move(current_center, new_center))
+
+    def test_moves_round_trip(self):
+        move = Move("c3", "c4")
+        self.assertEqual(move, Move((3, 3), (4, 3)))
+        self.assertEqual(move.centers(), ("c3", "c4"))
+        self.assertEqual(Move.parse(str(move)), move)
+        self.assertEqual(pickle.loads(pickle.dumps(move)), move)
+
+
+class BoardSizeTest(unittest.TestCase):
+    """Boards other than 20x20, including ones too large to keep their sweep masks and ones with columns past 'Z'."""
+
+    def _positions(self, size):
+        """Yields unfinished games on a board with 'size' rows and columns, reached by seeded random play."""
+        rng = random.Random(size)
+        game = GessGame(size)
+        for ply in range(12):
+            if ply % 4 == 0:
+                yield game.clone()
+            move = game.random_move(rng)
+            if move is None or not game.make_move(move) or game.get_game_state() != 'UNFINISHED':
+                break
+
+    def _check_legal_moves(self, size):
+        for game in self._positions(size):
+            moves = list(game.legal_moves())
+            self.assertTrue(moves)
+            self.assertEqual(set(moves), set(brute_force_moves(game)))
+
+    def test_legal_moves_match_brute_force(self):
+        for size in (21, 23):
+            self._check_legal_moves(size)
+
+    def test_legal_moves_match_brute_force_without_sweep_masks(self):
+        # The same check on a board built as if it were too large to keep its sweep masks and Moves
+        with mock.patch.object(gess_module, '_MAX_CACHED_SIZE', 20), mock.patch.dict(gess_module._boards, clear=True):
+            self.assertFalse(GessGame(21)._board.cached)
+            self._check_legal_moves(21)
+        self.assertTrue(GessGame(21)._board.cached)
+
+    def test_large_board_matches_cached_board(self):
+        with mock.patch.object(gess_module, '_MAX_CACHED_SIZE', 20), mock.patch.dict(gess_module._boards, clear=True):
+            uncached = list(self._positions(24))
+        cached = list(self._positions(24))
+        self.assertEqual(len(uncached), len(cached))
+        for game, other in zip(uncached, cached):
+            self.assertEqual(game.to_bytes(), other.to_bytes())
+            self.assertEqual(list(game.legal_moves()), list(other.legal_moves()))
+            for direction in ("N", "SE", "W"):
+                self.assertEqual(game.farthest_reach("k8", direction), other.farthest_reach("k8", direction))
+
+    def test_columns_past_z(self):
+        self.assertEqual(Move("ab10", "ab12"), Move((10, 28), (12, 28)))
+        self.assertEqual(Move((10, 28), (12, 28)).centers(), ("ab10", "ab12"))
+        layout = [list(row) for row in gess_module._default_layout(30)]
+        for row in (8, 9, 10):
+            layout[row][27] = 'X'
+        game = GessGame(30, [''.join(row) for row in layout])
+        self.assertTrue(game.is_valid_move("AB10", "ab15"))
+        self.assertFalse(game.is_valid_move("ab10", "ac11"))
+        self.assertTrue(game.make_move((10, 28), (15, 28)))
+        self.assertEqual(game.create_footprint("ab15")["C"], 'X')
+        self.assertNotEqual(game.create_footprint("ab10")["C"], 'X')
+
+    def test_tuple_centers(self):
+        game = GessGame()
+        self.assertTrue(game.is_valid_move((3, 3), (4, 3)))
+        self.assertFalse(game.is_valid_move((3, 3), (3, 3)))
+        self.assertFalse(game.make_move((3, 3), (21, 3)))
+        self.assertTrue(game.make_move((3, 3), (4, 3)))
+        self.assertEqual(game.get_current_player(), 'O')
+
+    def test_smaller_boards_need_a_layout(self):
+        self.assertRaises(ValueError, GessGame, 19)
+        self.assertRaises(ValueError, GessGame, 4, ['____'] * 4)
+
+
+class UndoAndHashTest(unittest.TestCase):
+    """push_move and pop_move put every part of the game back, and the position hash is kept up to date."""
+
+    def _state(self, game):
+        return game.to_bytes(), game.get_position_hash(), game.get_current_player(), game.get_game_state()
+
+    def test_push_and_pop_restore_the_game(self):
+        rng = random.Random(11)
+        game = GessGame()
+        for _ in range(30):
+            before = self._state(game)
+            moves = list(game.legal_moves())
+            for move in rng.sample(moves, min(5, len(moves))):
+                self.assertTrue(game.push_move(move))
+                game.pop_move()
+                self.assertEqual(self._state(game), before)
+            if not game.make_move(rng.choice(moves)) or game.get_game_state() != 'UNFINISHED':
+                break
+
+    def test_hash_matches_a_fresh_game(self):
+        rng = random.Random(12)
+        game = GessGame()
+        for _ in range(40):
+            move = game.random_move(rng)
+            if move is None or not game.make_move(move):
+                break
+            fresh = GessGame.from_bytes(game.to_bytes())
+            self.assertEqual(game.get_position_hash(), fresh.get_position_hash())
+
+    def test_pickled_game_shares_its_board(self):
+        game = GessGame()
+        game.make_move("c3", "c4")
+        copy = pickle.loads(pickle.dumps(game))
+        self.assertIs(copy._board, game._board)
+        self.assertEqual(copy.get_position_hash(), game.get_position_hash())
+        self.assertLess(len(pickle.dumps(game)), 1000)
+
+
+if __name__ == '__main__':
+    unittest.main()
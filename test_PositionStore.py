@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import PositionStore
+from GessGame import GessGame
+
+
+class PositionStoreTest(unittest.TestCase):
+    """Positions added to a store on disk, and the store reopened."""
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._directory.name, 'positions')
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def _games(self):
+        """Returns a game in the start position and the two positions after it."""
+        game = GessGame()
+        games = [game.clone()]
+        for current_center, new_center in (("c3", "c4"), ("c18", "c17")):
+            self.assertTrue(game.make_move(current_center, new_center))
+            games.append(game.clone())
+        return games
+
+    def test_add_and_find(self):
+        first, second, third = self._games()
+        with PositionStore.PositionStore(self._path) as store:
+            self.assertEqual(store.add(first), 0)
+            self.assertEqual(store.add(second), 1)
+            self.assertEqual(store.add(first), 0)
+            self.assertNotIn(third, store)
+        with PositionStore.PositionStore(self._path, readonly=True) as store:
+            self.assertEqual(len(store), 2)
+            self.assertEqual(store.find(second), 1)
+            self.assertEqual(store.get(1).to_bytes(), second.to_bytes())
+            self.assertRaises(ValueError, store.add, third)
+
+    def test_other_board_sizes_are_rejected(self):
+        with PositionStore.PositionStore(self._path) as store:
+            self.assertRaises(ValueError, store.add, GessGame(21))
+
+    def test_crash_before_counting_a_record(self):
+        first, second, third = self._games()
+        with PositionStore.PositionStore(self._path) as store:
+            store.add(first)
+            # Do what _add does up to where it writes the counts, as if the process died there
+            key = second.get_position_hash()
+            number, slot = store._lookup(key, second.to_bytes())
+            offset = PositionStore._DATA_HEADER.size + store._count * PositionStore._RECORD_SIZE
+            PositionStore._HASH.pack_into(store._data, offset, key)
+            store._data[offset + 8:offset + 8 + PositionStore.POSITION_SIZE] = second.to_bytes()
+            store._set_slot(slot, key, store._count)
+
+        with PositionStore.PositionStore(self._path) as store:
+            self.assertEqual(len(store), 1)
+            self.assertNotIn(second, store)
+            self.assertEqual(store.add(second), 1)
+            self.assertEqual(len(store), 2)
+            self.assertEqual(store.get(1).to_bytes(), second.to_bytes())
+            self.assertEqual(store.add(third), 2)
+            self.assertEqual(store.find(second), 1)
+            self.assertEqual(store.find(third), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()